@@ -12,6 +12,48 @@ from loguru import logger
 from utils.date_helper import DateHelper
 
 
+def _first_value(x):
+    """取分组内第一个值（保留 NaN，与 pandas 内置 first 跳过 NaN 不同）"""
+    return x.iloc[0] if len(x) > 0 else None
+
+
+def _last_value(x):
+    """取分组内最后一个值（保留 NaN，与 pandas 内置 last 跳过 NaN 不同）"""
+    return x.iloc[-1] if len(x) > 0 else None
+
+
+def _normalize_trade_date(series: pd.Series) -> pd.Series:
+    """
+    将交易日期列（datetime、date 或字符串）标准化为 YYYY-MM-DD 字符串，缺失值保持为 None
+    
+    - 字符串：复用 DateHelper.normalize_series_to_yyyy_mm_dd（仅接受 YYYYMMDD / YYYY-MM-DD，非法格式抛出异常）
+    - datetime / date：整列转换为 datetime64 后一次性 strftime
+    - 混合类型：退回逐个调用 DateHelper.parse_to_str
+    """
+    inferred = pd.api.types.infer_dtype(series, skipna=True)
+    if inferred in ('string', 'empty'):
+        return DateHelper.normalize_series_to_yyyy_mm_dd(series)
+    
+    if inferred in ('datetime64', 'datetime', 'date'):
+        mask = series.notna()
+        result = np.full(len(series), None, dtype=object)
+        result[mask.to_numpy()] = pd.to_datetime(series[mask]).dt.strftime('%Y-%m-%d').to_numpy()
+        return pd.Series(result, index=series.index)
+    
+    return series.map(lambda x: DateHelper.parse_to_str(x) if pd.notna(x) else None)
+
+
+# 聚合规则分派表：规则名 -> groupby.agg 可接受的函数或内置聚合名，模块加载时构建一次
+AGGREGATION_RULES = {
+    'first': _first_value,
+    'last': _last_value,
+    'max': 'max',
+    'min': 'min',
+    'sum': 'sum',
+    'mean': 'mean',
+}
+
+
 class Aggregator:
     """
     聚合计算器
@@ -122,10 +164,7 @@ class Aggregator:
         
         # 确保日期格式标准化
         if 'trade_date' in result_df.columns:
-            # 使用 parse_to_str 处理 datetime、date 和字符串类型
-            result_df['trade_date'] = result_df['trade_date'].apply(
-                lambda x: DateHelper.parse_to_str(x) if pd.notna(x) else None
-            )
+            result_df['trade_date'] = _normalize_trade_date(result_df['trade_date'])
         
         # 按股票代码和日期排序
         result_df = result_df.sort_values(['ts_code', 'trade_date']).reset_index(drop=True)
@@ -176,33 +215,15 @@ class Aggregator:
         # 合并用户规则和默认规则
         rules = {**default_rules, **aggregation_rules}
         
-        # 构建聚合字典
+        # 构建聚合字典（查分派表，不再逐条 if/elif 匹配规则名）
         agg_dict = {}
         for col, rule in rules.items():
             if col in intraday_df.columns:
-                if rule == 'first':
-                    # 使用自定义函数
-                    def first_func(x):
-                        return x.iloc[0] if len(x) > 0 else None
-                    agg_dict[col] = first_func
-                elif rule == 'last':
-                    # 使用自定义函数
-                    def last_func(x):
-                        return x.iloc[-1] if len(x) > 0 else None
-                    agg_dict[col] = last_func
-                elif rule == 'max':
-                    agg_dict[col] = 'max'
-                elif rule == 'min':
-                    agg_dict[col] = 'min'
-                elif rule == 'sum':
-                    agg_dict[col] = 'sum'
-                elif rule == 'mean':
-                    agg_dict[col] = 'mean'
-                else:
+                agg_func = AGGREGATION_RULES.get(rule)
+                if agg_func is None:
                     logger.warning(f"不支持的聚合规则: {rule}，使用默认规则 first")
-                    def first_func_default(x):
-                        return x.iloc[0] if len(x) > 0 else None
-                    agg_dict[col] = first_func_default
+                    agg_func = AGGREGATION_RULES['first']
+                agg_dict[col] = agg_func
         
         # 执行聚合
         result_df = intraday_df.groupby(['ts_code', 'trade_date']).agg(agg_dict).reset_index()
@@ -218,10 +239,7 @@ class Aggregator:
         
         # 确保日期格式标准化
         if 'trade_date' in result_df.columns:
-            # 使用 parse_to_str 处理 datetime、date 和字符串类型
-            result_df['trade_date'] = result_df['trade_date'].apply(
-                lambda x: DateHelper.parse_to_str(x) if pd.notna(x) else None
-            )
+            result_df['trade_date'] = _normalize_trade_date(result_df['trade_date'])
         
         logger.info(f"自定义规则聚合完成，共生成 {len(result_df)} 条日K线数据")
         return result_df
@@ -161,31 +161,16 @@ class IndicatorCalculator:
         # 将 NaN 替换为 50（对于 rolling 窗口不足的情况）
         rsv = np.nan_to_num(rsv, nan=50.0)
         
-        # 计算K值（初始值为50）
-        k_values = np.zeros(len(df_copy))
-        k_values[0] = 50.0
-        
-        for i in range(1, len(df_copy)):
-            # 处理可能的 NaN
-            if np.isnan(k_values[i-1]) or np.isnan(rsv[i]):
-                k_values[i] = 50.0
-            else:
-                k_values[i] = (2/3) * k_values[i-1] + (1/3) * rsv[i]
-        
+        # 计算K值（初始值为50）：K_i = (2/3) * K_{i-1} + (1/3) * RSV_i 即 alpha=1/3 的
+        # 非调整指数加权平均，以 50 作为首个观测值后交给 ewm 一次向量化完成递推
+        rsv[0] = 50.0
+        k_values = pd.Series(rsv, index=df_copy.index).ewm(alpha=1/3, adjust=False).mean()
         df_copy['kdj_k'] = k_values
         
-        # 计算D值（初始值为50）
-        d_values = np.zeros(len(df_copy))
-        d_values[0] = 50.0
-        
-        for i in range(1, len(df_copy)):
-            # 处理可能的 NaN
-            if np.isnan(d_values[i-1]) or np.isnan(k_values[i]):
-                d_values[i] = 50.0
-            else:
-                d_values[i] = (2/3) * d_values[i-1] + (1/3) * k_values[i]
-        
-        df_copy['kdj_d'] = d_values
+        # 计算D值（初始值为50）：对K值做同样的平滑
+        k_seed = k_values.to_numpy(copy=True)
+        k_seed[0] = 50.0
+        df_copy['kdj_d'] = pd.Series(k_seed, index=df_copy.index).ewm(alpha=1/3, adjust=False).mean()
         
         # 计算J值
         df_copy['kdj_j'] = 3 * df_copy['kdj_k'] - 2 * df_copy['kdj_d']
@@ -376,23 +361,19 @@ class IndicatorCalculator:
         df_copy = df.copy()
         
         # 计算前一日收盘价
-        df_copy['pre_close_shift'] = df_copy['close'].shift(1)
-        
-        # 计算真实波幅
-        df_copy['tr'] = df_copy[['high', 'low', 'pre_close_shift']].apply(
-            lambda row: max(
-                row['high'] - row['low'],
-                abs(row['high'] - row['pre_close_shift']) if pd.notna(row['pre_close_shift']) else 0,
-                abs(row['low'] - row['pre_close_shift']) if pd.notna(row['pre_close_shift']) else 0
-            ),
-            axis=1
-        )
+        pre_close = df_copy['close'].shift(1)
+        
+        # 计算真实波幅（列级运算代替逐行 apply；无前收盘价时后两项按 0 处理）
+        high_low = df_copy['high'] - df_copy['low']
+        high_close = (df_copy['high'] - pre_close).abs().fillna(0)
+        low_close = (df_copy['low'] - pre_close).abs().fillna(0)
+        df_copy['tr'] = np.maximum(high_low, np.maximum(high_close, low_close))
         
         # 计算ATR
         df_copy['atr'] = df_copy['tr'].rolling(window=period).mean()
         
         # 删除临时列
-        df_copy = df_copy.drop(['pre_close_shift', 'tr'], axis=1)
+        df_copy = df_copy.drop(['tr'], axis=1)
         
         # logger.debug(f"计算ATR: period={period}")
         
@@ -5,6 +5,7 @@
 """
 
 from typing import Any, Dict, List, Optional
+from concurrent.futures import ThreadPoolExecutor, as_completed
 import pandas as pd
 from loguru import logger
 
@@ -117,19 +118,31 @@ class AdjFactorCollector(BaseCollector):
         """
         获取指定股票列表的复权因子数据
         
+        使用有界线程池并发采集，调用频率由 provider 的限流器统一控制；
+        单只股票采集失败只记录日志，不影响其他股票。
+        
         Args:
             ts_codes: 股票代码列表
             
         Returns:
-            pd.DataFrame: 合并后的复权因子数据
+            pd.DataFrame: 合并后的复权因子数据（按输入股票顺序）
         """
-        all_results = []
-        for ts_code in ts_codes:
-            df = self.get_single_stock_adj_factor(ts_code)
-            if not df.empty:
-                all_results.append(df)
+        max_workers = self.config.get("max_workers", 4)
+        results: Dict[str, pd.DataFrame] = {}
+        with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="adj_factor_fetch") as executor:
+            futures = {executor.submit(self.get_single_stock_adj_factor, ts_code): ts_code for ts_code in ts_codes}
+            for future in as_completed(futures):
+                ts_code = futures[future]
+                try:
+                    df = future.result()
+                except Exception as e:
+                    logger.warning(f"采集股票 {ts_code} 的复权因子失败: {e}")
+                    continue
+                if not df.empty:
+                    results[ts_code] = df
         
+        all_results = [results[ts_code] for ts_code in ts_codes if ts_code in results]
         if all_results:
             return pd.concat(all_results, ignore_index=True)
         else:
-            return pd.DataFrame(columns=['ts_code', 'trade_date', 'adj_factor'])
\ No newline at end of file
+            return pd.DataFrame(columns=['ts_code', 'trade_date', 'adj_factor'])
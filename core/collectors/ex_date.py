@@ -138,11 +138,22 @@ class ExDateCollector(BaseCollector):
         Returns:
             pd.DataFrame: 合并后的除权除息日数据
         """
-        all_results = []
-        for ts_code in ts_codes:
-            df = self.get_single_stock_ex_dates(ts_code)
-            if not df.empty:
-                all_results.append(df)
+        provider = self._get_provider()
+        fields = "ts_code,ex_date"
+        jobs = [{"api_name": "dividend", "fields": fields, "ts_code": ts_code} for ts_code in ts_codes]
+        
+        # 逐只股票的查询并发发起，限流由 provider 统一控制
+        try:
+            results = provider.query_many(jobs)
+        except Exception as e:
+            logger.error(f"批量采集除权除息日数据失败: {e}")
+            raise CollectorException(f"批量采集除权除息日数据失败: {e}") from e
+        
+        all_results = [
+            df[df.ex_date.notna()] for df in results
+            if df is not None and not df.empty
+        ]
+        all_results = [df for df in all_results if not df.empty]
         
         if all_results:
             return pd.concat(all_results, ignore_index=True)
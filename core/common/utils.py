@@ -5,6 +5,7 @@
 """
 
 from typing import Any, Dict, List
+import numpy as np
 import pandas as pd
 
 
@@ -12,13 +13,33 @@ def merge_dataframes(df_list: List[pd.DataFrame]) -> pd.DataFrame:
     """
     合并多个 DataFrame
     
+    同一数据源产生的多批数据列名和类型完全一致时，按列直接拼接底层 ndarray，
+    最后一次性构建 DataFrame，省去 pd.concat 的索引对齐和类型推断；
+    列或类型不一致（或包含扩展类型）时退回 pd.concat
+    
     Args:
-        df_list: DataFrame 列表
+        df_list: DataFrame 列表（None 会被忽略）
         
     Returns:
-        合并后的 DataFrame
+        合并后的 DataFrame（索引重置为 0..n-1）
     """
-    raise NotImplementedError("merge_dataframes 方法待实现")
+    frames = [df for df in df_list if df is not None]
+    if not frames:
+        return pd.DataFrame()
+    if len(frames) == 1:
+        return frames[0].reset_index(drop=True)
+    
+    first = frames[0]
+    columns = first.columns
+    dtypes = first.dtypes
+    fast_path = columns.is_unique and all(isinstance(dtype, np.dtype) for dtype in dtypes) and all(
+        df.columns.equals(columns) and df.dtypes.equals(dtypes) for df in frames[1:]
+    )
+    if not fast_path:
+        return pd.concat(frames, ignore_index=True)
+    
+    data = {col: np.concatenate([df[col].to_numpy() for df in frames]) for col in columns}
+    return pd.DataFrame(data, columns=columns, copy=False)
 
 
 def chunk_dataframe(df: pd.DataFrame, chunk_size: int) -> List[pd.DataFrame]:
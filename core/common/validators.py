@@ -4,12 +4,27 @@
 提供数据质量验证相关的工具函数
 """
 
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Tuple
 import pandas as pd
 
+from core.common.exceptions import ValidationException
+
+
+# validate_data_types 中 Python 类型对应的 pandas.api.types.infer_dtype 结果
+_INFERRED_TYPES = {
+    int: {"integer"},
+    float: {"floating", "integer", "mixed-integer-float", "decimal"},
+    str: {"string"},
+    bool: {"boolean"},
+}
+
 
 class DataValidator:
-    """数据验证器基类"""
+    """
+    数据验证器基类
+    
+    所有校验都按列整体进行（布尔掩码 / 类型推断），不逐行遍历
+    """
     
     @staticmethod
     def validate_required_columns(df: pd.DataFrame, required_columns: List[str]) -> bool:
@@ -26,21 +41,60 @@ class DataValidator:
         Raises:
             ValidationException: 当缺少必需列时抛出异常
         """
-        raise NotImplementedError("validate_required_columns 方法待实现")
+        missing_columns = [col for col in required_columns if col not in df.columns]
+        if missing_columns:
+            raise ValidationException(f"缺少必需的列: {missing_columns}")
+        return True
     
     @staticmethod
     def validate_data_types(df: pd.DataFrame, column_types: Dict[str, type]) -> bool:
         """
         验证 DataFrame 列的数据类型
         
+        按列推断类型（忽略缺失值），不逐个单元格做 isinstance 判断
+        
         Args:
             df: 待验证的 DataFrame
-            column_types: 列名到类型的映射字典
+            column_types: 列名到类型的映射字典（支持 int、float、str、bool）
             
         Returns:
-            bool: 验证是否通过
+            bool: 验证是否通过（缺少列也视为不通过）
+        """
+        for col, expected_type in column_types.items():
+            if col not in df.columns:
+                return False
+            inferred = pd.api.types.infer_dtype(df[col], skipna=True)
+            if inferred == "empty":
+                continue
+            if inferred not in _INFERRED_TYPES.get(expected_type, set()):
+                return False
+        return True
+    
+    @staticmethod
+    def build_range_mask(df: pd.DataFrame, column_ranges: Dict[str, tuple]) -> pd.Series:
+        """
+        构建数据范围校验掩码
+        
+        Args:
+            df: 待验证的 DataFrame
+            column_ranges: 列名到 (min, max) 范围的映射字典，边界为 None 表示不限制；
+                缺失值不参与范围校验
+            
+        Returns:
+            pd.Series: 布尔掩码，True 表示该行所有列都在范围内
         """
-        raise NotImplementedError("validate_data_types 方法待实现")
+        mask = pd.Series(True, index=df.index)
+        for col, (min_value, max_value) in column_ranges.items():
+            if col not in df.columns:
+                continue
+            values = df[col]
+            in_range = values.notna()
+            if min_value is not None:
+                in_range &= values >= min_value
+            if max_value is not None:
+                in_range &= values <= max_value
+            mask &= in_range | values.isna()
+        return mask
     
     @staticmethod
     def validate_data_range(df: pd.DataFrame, column_ranges: Dict[str, tuple]) -> bool:
@@ -54,5 +108,19 @@ class DataValidator:
         Returns:
             bool: 验证是否通过
         """
-        raise NotImplementedError("validate_data_range 方法待实现")
-
+        return bool(DataValidator.build_range_mask(df, column_ranges).all())
+    
+    @staticmethod
+    def split_by_range(df: pd.DataFrame, column_ranges: Dict[str, tuple]) -> Tuple[pd.DataFrame, pd.DataFrame]:
+        """
+        按数据范围将 DataFrame 拆分为合法部分和非法部分（各切片一次）
+        
+        Args:
+            df: 待验证的 DataFrame
+            column_ranges: 列名到 (min, max) 范围的映射字典
+            
+        Returns:
+            Tuple[pd.DataFrame, pd.DataFrame]: (合法数据, 非法数据)
+        """
+        mask = DataValidator.build_range_mask(df, column_ranges)
+        return df[mask], df[~mask]
@@ -28,7 +28,7 @@ class AdjFactorLoader(BaseLoader):
         Args:
             config: 配置字典，包含：
                 - table: 表名（默认 "adj_factor"）
-                - batch_size: 批量大小（默认 1000）
+                - batch_size: 批量大小（默认 5000，复权因子仅三列，单条 executemany 可容纳更多行）
                 - upsert_keys: upsert 的键（默认 ['ts_code', 'trade_date']）
         """
         if config is None:
@@ -37,6 +37,8 @@ class AdjFactorLoader(BaseLoader):
             config['table'] = 'adj_factor'
         if 'upsert_keys' not in config:
             config['upsert_keys'] = ['ts_code', 'trade_date']
+        if 'batch_size' not in config:
+            config['batch_size'] = 5000
         
         super().__init__(config)
     
@@ -107,19 +109,15 @@ class AdjFactorLoader(BaseLoader):
                 # 排序（按股票代码和交易日期）
                 query = query.order_by(model_class.ts_code, model_class.trade_date)
                 
-                results = query.all()
+                # 未指定股票时为全市场读取，分块流式读取以降低内存峰值
+                df = self._read_query(
+                    session, query,
+                    chunksize=self.READ_CHUNK_SIZE if ts_code is None else None
+                )
                 
-                if not results:
+                if df.empty:
                     logger.info("数据库中未找到复权因子数据")
-                    return pd.DataFrame()
-                
-                # 转换为DataFrame（使用 _model_to_dict 处理 DECIMAL 类型转换）
-                data = [AdjFactorORM._model_to_dict(row) for row in results]
-                df = pd.DataFrame(data)
-                
-                # 转换trade_date为datetime（如果存在）
-                if "trade_date" in df.columns:
-                    df["trade_date"] = pd.to_datetime(df["trade_date"], errors='coerce')
+                    return df
                 
                 logger.info(f"从数据库读取到 {len(df)} 条复权因子数据（所有历史除权除息日）")
                 return df
@@ -7,18 +7,18 @@
 from abc import ABC, abstractmethod
 from typing import Any, Dict, Optional, List
 import os
+import threading
 import pandas as pd
-import numpy as np
 from loguru import logger
 from contextlib import contextmanager
+from functools import lru_cache
 from sqlalchemy import create_engine, text
 from sqlalchemy.orm import sessionmaker, Session
 from sqlalchemy.pool import QueuePool
-import dotenv
 
 from core.common.exceptions import LoaderException
-
-dotenv.load_dotenv()
+from core.common.utils import merge_dataframes
+from utils.env_helper import load_env
 
 
 class BaseLoader(ABC):
@@ -34,9 +34,14 @@ class BaseLoader(ABC):
     LOAD_STRATEGY_REPLACE = "replace"  # 替换数据
     LOAD_STRATEGY_UPSERT = "upsert"  # 存在则更新，不存在则插入
     
-    # 数据库连接（类级别单例）
+    # 不按股票过滤的全表读取使用服务端游标分块流式读取，每块行数
+    READ_CHUNK_SIZE = 50000
+    
+    # 数据库连接（进程级单例：保存在 BaseLoader 上，所有加载器子类共享同一个引擎和连接池）
     _engine = None
     _SessionLocal = None
+    _engine_pid = None
+    _engine_lock = threading.Lock()
     
     def __init__(self, config: Optional[Dict[str, Any]] = None):
         """
@@ -52,38 +57,63 @@ class BaseLoader(ABC):
     
     @classmethod
     def _get_engine(cls):
-        """获取数据库引擎（单例模式）"""
-        if cls._engine is None:
-            # 从环境变量读取MySQL配置
-            host = os.getenv("MYSQL_HOST", "localhost")
-            port = int(os.getenv("MYSQL_PORT", "3306"))
-            user = os.getenv("MYSQL_USER", "root")
-            password = os.getenv("MYSQL_PASSWORD", "")
-            database = os.getenv("MYSQL_DATABASE", "stock_data")
-            charset = os.getenv("MYSQL_CHARSET", "utf8mb4")
-            
-            # 构建连接URL
-            connection_url = f"mysql+pymysql://{user}:{password}@{host}:{port}/{database}?charset={charset}"
+        """
+        获取数据库引擎（进程级单例）
+        
+        引擎创建后写在 BaseLoader 上而不是各子类上，避免每个加载器类各建一个连接池；
+        fork 出的子进程会丢弃继承来的连接池并重新创建，不与父进程共用连接。
+        """
+        if cls._engine is not None and BaseLoader._engine_pid == os.getpid():
+            return cls._engine
+        
+        with BaseLoader._engine_lock:
+            if BaseLoader._engine is not None and BaseLoader._engine_pid != os.getpid():
+                # 子进程中只丢弃连接池引用，不关闭父进程仍在使用的连接
+                BaseLoader._engine.dispose(close=False)
+                BaseLoader._engine = None
+                BaseLoader._SessionLocal = None
             
-            # 创建引擎，配置连接池
-            cls._engine = create_engine(
-                connection_url,
-                poolclass=QueuePool,
-                pool_size=10,
-                max_overflow=20,
-                pool_pre_ping=True,
-                echo=False,
-            )
-            logger.debug(f"MySQL engine created: {host}:{port}/{database}")
+            if BaseLoader._engine is None:
+                # 从环境变量读取MySQL配置
+                load_env()
+                host = os.getenv("MYSQL_HOST", "localhost")
+                port = int(os.getenv("MYSQL_PORT", "3306"))
+                user = os.getenv("MYSQL_USER", "root")
+                password = os.getenv("MYSQL_PASSWORD", "")
+                database = os.getenv("MYSQL_DATABASE", "stock_data")
+                charset = os.getenv("MYSQL_CHARSET", "utf8mb4")
+                pool_size = int(os.getenv("MYSQL_POOL_SIZE", "10"))
+                max_overflow = int(os.getenv("MYSQL_MAX_OVERFLOW", "20"))
+                pool_recycle = int(os.getenv("MYSQL_POOL_RECYCLE", "1800"))
+                
+                # 构建连接URL
+                connection_url = f"mysql+pymysql://{user}:{password}@{host}:{port}/{database}?charset={charset}"
+                
+                # 创建引擎，配置连接池（pool_recycle 早于 MySQL wait_timeout 回收空闲连接，
+                # 避免长时间运行的流水线取到已被服务端断开的连接）
+                BaseLoader._engine = create_engine(
+                    connection_url,
+                    poolclass=QueuePool,
+                    pool_size=pool_size,
+                    max_overflow=max_overflow,
+                    pool_pre_ping=True,
+                    pool_recycle=pool_recycle,
+                    echo=False,
+                )
+                BaseLoader._engine_pid = os.getpid()
+                logger.debug(f"MySQL engine created: {host}:{port}/{database}")
         
         return cls._engine
     
     @classmethod
     def _get_session_factory(cls):
-        """获取Session工厂（单例模式）"""
+        """获取Session工厂（进程级单例，与引擎一同共享）"""
+        engine = cls._get_engine()
         if cls._SessionLocal is None:
-            cls._SessionLocal = sessionmaker(
-                bind=cls._get_engine(),
+            # 子类单独指定了引擎时，Session 工厂也只挂在该子类上
+            owner = BaseLoader if engine is BaseLoader._engine else cls
+            owner._SessionLocal = sessionmaker(
+                bind=engine,
                 autocommit=False,
                 autoflush=False
             )
@@ -102,7 +132,39 @@ class BaseLoader(ABC):
             raise
         finally:
             session.close()
-    
+
+    @staticmethod
+    def _read_query(session: Session, query, chunksize: Optional[int] = None) -> pd.DataFrame:
+        """
+        将 ORM 查询结果直接读取为 DataFrame
+
+        不逐行实例化 ORM 对象、也不逐个单元格格式化日期，而是由游标结果整体构建
+        DataFrame：DECIMAL 列经 coerce_float 转为 float，trade_date 列统一转换为 datetime。
+
+        Args:
+            session: 数据库会话
+            query: ORM 查询对象
+            chunksize: 分块大小（可选）。指定时使用服务端游标流式读取，每次只在客户端缓存
+                一块原始行并转换为 DataFrame，适合全市场等大结果集，降低内存峰值
+
+        Returns:
+            pd.DataFrame: 查询结果（无数据时为空 DataFrame）
+        """
+        if chunksize:
+            statement = query.statement.execution_options(stream_results=True)
+            chunks = pd.read_sql(statement, session.connection(), coerce_float=True, chunksize=chunksize)
+            df = merge_dataframes(list(chunks))
+        else:
+            df = pd.read_sql(query.statement, session.connection(), coerce_float=True)
+        if df.empty:
+            return pd.DataFrame()
+
+        # 转换trade_date为datetime（如果存在）
+        if "trade_date" in df.columns:
+            df["trade_date"] = pd.to_datetime(df["trade_date"], errors='coerce')
+
+        return df
+
     @abstractmethod
     def load(self, data: pd.DataFrame, strategy: str) -> None:
         """
@@ -137,6 +199,20 @@ class BaseLoader(ABC):
         """
         pass
     
+    @staticmethod
+    @lru_cache(maxsize=None)
+    def _get_model_columns(model_class) -> frozenset:
+        """
+        获取ORM模型的列名集合（按模型类缓存，表结构在进程内不变，无需每次写入重新遍历）
+        
+        Args:
+            model_class: ORM模型类
+            
+        Returns:
+            列名集合
+        """
+        return frozenset(col.name for col in model_class.__table__.columns)
+    
     def _validate_data_before_load(self, data: pd.DataFrame) -> bool:
         """
         加载前验证数据
@@ -175,14 +251,15 @@ class BaseLoader(ABC):
         model_class = self._get_orm_model()
         
         # 获取表中实际存在的列
-        model_columns = {col.name for col in model_class.__table__.columns}
+        model_columns = self._get_model_columns(model_class)
         available_columns = [col for col in data.columns if col in model_columns]
         
         if not available_columns:
             raise LoaderException("DataFrame 中没有与表匹配的列")
         
-        df_to_write = data[available_columns].copy()
-        df_to_write = df_to_write.where(pd.notna(df_to_write), None)
+        # 列选择本身已返回新对象，且后续写入不会修改该 DataFrame，无需再 copy；
+        # NaN/NaT 在 _dataframe_to_records 中统一转换为 None
+        df_to_write = data[available_columns]
         
         # 使用 INSERT IGNORE 跳过重复数据
         with self._get_session() as session:
@@ -216,14 +293,15 @@ class BaseLoader(ABC):
             raise LoaderException("表没有主键，无法使用替换模式")
         
         # 获取表中实际存在的列
-        model_columns = {col.name for col in model_class.__table__.columns}
+        model_columns = self._get_model_columns(model_class)
         available_columns = [col for col in data.columns if col in model_columns]
         
         if not available_columns:
             raise LoaderException("DataFrame 中没有与表匹配的列")
         
-        df_to_write = data[available_columns].copy()
-        df_to_write = df_to_write.where(pd.notna(df_to_write), None)
+        # 列选择本身已返回新对象，且后续写入不会修改该 DataFrame，无需再 copy；
+        # NaN/NaT 在 _dataframe_to_records 中统一转换为 None
+        df_to_write = data[available_columns]
         
         # 构建删除条件：删除所有匹配主键的记录
         with self._get_session() as session:
@@ -238,14 +316,16 @@ class BaseLoader(ABC):
                     params = {f'val_{i}': val for i, val in enumerate(key_values)}
                     session.execute(delete_stmt, params)
             else:
-                # 复合主键：需要逐条删除
-                for _, row in df_to_write.iterrows():
-                    conditions = []
-                    params = {}
-                    for i, key in enumerate(primary_keys):
-                        conditions.append(f"`{key}` = :key_{i}")
-                        params[f"key_{i}"] = row[key]
-                    delete_stmt = text(f"DELETE FROM `{table_name}` WHERE {' AND '.join(conditions)}")
+                # 复合主键：语句只构建一次，按主键列整体取值后一次 executemany 删除，
+                # 避免 iterrows 逐行构造 Series 和重复拼接 SQL
+                conditions = [f"`{key}` = :key_{i}" for i, key in enumerate(primary_keys)]
+                delete_stmt = text(f"DELETE FROM `{table_name}` WHERE {' AND '.join(conditions)}")
+                param_names = [f"key_{i}" for i in range(len(primary_keys))]
+                params = [
+                    dict(zip(param_names, key_values))
+                    for key_values in df_to_write[primary_keys].drop_duplicates().itertuples(index=False, name=None)
+                ]
+                if params:
                     session.execute(delete_stmt, params)
             
             # 插入新数据
@@ -270,14 +350,15 @@ class BaseLoader(ABC):
         model_class = self._get_orm_model()
         
         # 获取表中实际存在的列
-        model_columns = {col.name for col in model_class.__table__.columns}
+        model_columns = self._get_model_columns(model_class)
         available_columns = [col for col in data.columns if col in model_columns]
         
         if not available_columns:
             raise LoaderException("DataFrame 中没有与表匹配的列")
         
-        df_to_write = data[available_columns].copy()
-        df_to_write = df_to_write.where(pd.notna(df_to_write), None)
+        # 列选择本身已返回新对象，且后续写入不会修改该 DataFrame，无需再 copy；
+        # NaN/NaT 在 _dataframe_to_records 中统一转换为 None
+        df_to_write = data[available_columns]
         
         # 获取需要保留NULL的列（从配置中读取）
         preserve_null_columns = self.config.get("preserve_null_columns", [])
@@ -292,6 +373,25 @@ class BaseLoader(ABC):
         
         # logger.debug(f"更新或插入模式加载完成，共处理 {inserted_count} 条记录")
     
+    @staticmethod
+    def _dataframe_to_records(df: pd.DataFrame) -> List[Dict[str, Any]]:
+        """
+        将DataFrame转换为参数字典列表（NaN/NaT 统一转换为 None，确保 MySQL 兼容性）
+        
+        先整体转为 object 再按列掩码替换缺失值，避免逐个单元格判断；
+        转为 object 后单元格已是 Python 原生类型，直接取二维数组的行与列名组装字典，
+        省去 to_dict('records') 逐个单元格的类型装箱检查
+        
+        Args:
+            df: 要转换的DataFrame
+            
+        Returns:
+            参数字典列表
+        """
+        columns = list(df.columns)
+        rows = df.astype(object).where(pd.notna(df), None).to_numpy().tolist()
+        return [dict(zip(columns, row)) for row in rows]
+    
     def _bulk_insert_dataframe(
         self,
         session: Session,
@@ -319,19 +419,13 @@ class BaseLoader(ABC):
         table = model_class.__table__
         table_name = table.name
         
-        records = df.to_dict('records')
+        records = self._dataframe_to_records(df)
         total_rows = len(records)
         
         if total_rows == 0:
             return 0
         
-        # 将字典中的 NaN 值转换为 None，确保 MySQL 兼容性
-        for record in records:
-            for key, value in record.items():
-                if pd.isna(value) or (isinstance(value, float) and np.isnan(value)):
-                    record[key] = None
-        
-        columns = list(records[0].keys())
+        columns = list(df.columns)
         columns_str = ', '.join([f'`{col}`' for col in columns])
         placeholders = ', '.join([f':{col}' for col in columns])
         
@@ -343,12 +437,10 @@ class BaseLoader(ABC):
         stmt = text(sql)
         inserted_count = 0
         
-        # 分批处理
+        # 分批处理：每批一次 executemany（pymysql 会改写为多行 VALUES），而不是逐行 execute
         for i in range(0, total_rows, self.batch_size):
             chunk = records[i:i + self.batch_size]
-            for record in chunk:
-                params = {col: record.get(col) for col in columns}
-                session.execute(stmt, params)
+            session.execute(stmt, chunk)
             inserted_count += len(chunk)
         
         return inserted_count
@@ -381,21 +473,15 @@ class BaseLoader(ABC):
         table_name = table.name
         primary_keys = [key.name for key in table.primary_key.columns]
         
-        records = df.to_dict('records')
+        records = self._dataframe_to_records(df)
         total_rows = len(records)
         
         if total_rows == 0:
             return 0
         
-        # 将字典中的 NaN 值转换为 None，确保 MySQL 兼容性
-        for record in records:
-            for key, value in record.items():
-                if pd.isna(value) or (isinstance(value, float) and np.isnan(value)):
-                    record[key] = None
-        
         preserve_null_set = set(preserve_null_columns) if preserve_null_columns else set()
         
-        columns = list(records[0].keys())
+        columns = list(df.columns)
         columns_str = ', '.join([f'`{col}`' for col in columns])
         placeholders = ', '.join([f':{col}' for col in columns])
         
@@ -424,12 +510,10 @@ class BaseLoader(ABC):
         stmt = text(sql)
         inserted_count = 0
         
-        # 分批处理
+        # 分批处理：每批一次 executemany（pymysql 会改写为多行 VALUES），而不是逐行 execute
         for i in range(0, total_rows, self.batch_size):
             chunk = records[i:i + self.batch_size]
-            for record in chunk:
-                params = {col: record.get(col) for col in columns}
-                session.execute(stmt, params)
+            session.execute(stmt, chunk)
             inserted_count += len(chunk)
         
         return inserted_count
@@ -4,8 +4,11 @@
 负责将处理后的股票基本信息数据持久化到数据库
 """
 
+import threading
+import time
 from typing import Any, Dict, List, Optional
 import pandas as pd
+from sqlalchemy import select
 from loguru import logger
 from datetime import datetime
 
@@ -22,6 +25,11 @@ class BasicInfoLoader(BaseLoader):
     将转换后的股票基本信息数据加载到数据库表中
     """
     
+    # 股票代码列表的进程内缓存（秒）：同一进程内多个流水线重复获取时不再查库，写入后立即失效
+    TS_CODES_CACHE_TTL = 3600
+    _ts_codes_cache = None  # (缓存时间, 股票代码元组)
+    _ts_codes_cache_lock = threading.Lock()
+    
     def __init__(self, config: Dict[str, Any] = None):
         """
         初始化股票基本信息加载器
@@ -29,7 +37,7 @@ class BasicInfoLoader(BaseLoader):
         Args:
             config: 配置字典，包含：
                 - table: 表名（默认 "basic_info"）
-                - batch_size: 批量大小（默认 1000）
+                - batch_size: 批量大小（默认 10000，全市场约五千只股票，一次 executemany 即可写完）
                 - upsert_keys: upsert 的键（默认 ['ts_code']）
         """
         if config is None:
@@ -38,6 +46,8 @@ class BasicInfoLoader(BaseLoader):
             config['table'] = 'basic_info'
         if 'upsert_keys' not in config:
             config['upsert_keys'] = ['ts_code']
+        if 'batch_size' not in config:
+            config['batch_size'] = 10000
         
         super().__init__(config)
     
@@ -69,11 +79,10 @@ class BasicInfoLoader(BaseLoader):
         logger.info(f"开始加载股票基本信息到表 {self.table}，数据量: {len(data)}")
         
         try:
-            # 添加更新时间（如果配置需要）
-            data_copy = data.copy()
+            # 添加更新时间（如果配置需要）；assign 返回新对象，不修改调用方数据，也无需先整体 copy
+            data_copy = data
             if 'updated_at' not in data_copy.columns:
-                today = DateHelper.today()
-                data_copy['updated_at'] = today
+                data_copy = data.assign(updated_at=DateHelper.today())
             
             # 根据加载策略选择加载方式
             if strategy == self.LOAD_STRATEGY_APPEND:
@@ -85,6 +94,7 @@ class BasicInfoLoader(BaseLoader):
             else:
                 raise LoaderException(f"不支持的加载策略: {strategy}")
             
+            self._invalidate_ts_codes_cache()
             logger.info(f"股票基本信息数据加载完成，表: {self.table}")
             
         except Exception as e:
@@ -92,15 +102,31 @@ class BasicInfoLoader(BaseLoader):
             raise LoaderException(f"加载股票基本信息数据失败: {e}") from e
 
 
+    @classmethod
+    def _invalidate_ts_codes_cache(cls) -> None:
+        """清空股票代码列表缓存"""
+        with cls._ts_codes_cache_lock:
+            BasicInfoLoader._ts_codes_cache = None
+    
     def get_all_ts_codes(self) -> List[str]:
         """
         获取数据库中所有的股票代码列表
+        
+        TS_CODES_CACHE_TTL 有效期内直接返回缓存结果，load 写入后缓存失效
         """
+        with self._ts_codes_cache_lock:
+            entry = self._ts_codes_cache
+        if entry is not None and time.monotonic() - entry[0] < self.TS_CODES_CACHE_TTL:
+            return list(entry[1])
+        
         try:
             with self._get_session() as session:
-                query = session.query(BasicInfoORM.ts_code).distinct()
-                results = query.all()
-                return [result.ts_code for result in results]
+                # ts_code 是主键，走主键索引即可完成；scalars 直接返回标量，不逐行构造 Row
+                ts_codes = list(session.execute(select(BasicInfoORM.ts_code).distinct()).scalars())
+            
+            with self._ts_codes_cache_lock:
+                BasicInfoLoader._ts_codes_cache = (time.monotonic(), tuple(ts_codes))
+            return ts_codes
 
         except Exception as e:
             logger.error(f"获取股票代码列表失败: {e}")
@@ -121,32 +147,21 @@ class BasicInfoLoader(BaseLoader):
         """
         try:
             with self._get_session() as session:
-                query = session.query(BasicInfoORM)
+                # 只查询需要的列，由游标结果直接构建 DataFrame，不逐行实例化 ORM 对象
+                query = session.query(
+                    BasicInfoORM.ts_code,
+                    BasicInfoORM.name,
+                    BasicInfoORM.symbol,
+                    BasicInfoORM.area,
+                    BasicInfoORM.industry,
+                    BasicInfoORM.market,
+                )
                 
                 # 如果指定了股票代码，进行过滤
                 if ts_codes is not None and len(ts_codes) > 0:
                     query = query.filter(BasicInfoORM.ts_code.in_(ts_codes))
                 
-                results = query.all()
-                
-                if not results:
-                    return pd.DataFrame()
-                
-                # 转换为DataFrame
-                data = []
-                for row in results:
-                    row_dict = {
-                        'ts_code': row.ts_code,
-                        'name': row.name,
-                        'symbol': row.symbol if hasattr(row, 'symbol') else None,
-                        'area': row.area if hasattr(row, 'area') else None,
-                        'industry': row.industry if hasattr(row, 'industry') else None,
-                        'market': row.market if hasattr(row, 'market') else None,
-                    }
-                    data.append(row_dict)
-                
-                df = pd.DataFrame(data)
-                return df
+                return self._read_query(session, query)
                 
         except Exception as e:
             logger.error(f"读取股票基本信息失败: {e}")
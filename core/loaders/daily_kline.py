@@ -29,7 +29,7 @@ class DailyKlineLoader(BaseLoader):
         Args:
             config: 配置字典，包含：
                 - table: 表名（默认 "daily_kline"）
-                - batch_size: 批量大小（默认 1000）
+                - batch_size: 批量大小（默认 5000，单行约十几列，5000 行一次 executemany 远低于 max_allowed_packet）
                 - upsert_keys: upsert 的键（默认 ['ts_code', 'trade_date']）
         """
         if config is None:
@@ -38,6 +38,8 @@ class DailyKlineLoader(BaseLoader):
             config['table'] = 'daily_kline'
         if 'upsert_keys' not in config:
             config['upsert_keys'] = ['ts_code', 'trade_date']
+        if 'batch_size' not in config:
+            config['batch_size'] = 5000
         
         super().__init__(config)
     
@@ -90,7 +92,7 @@ class DailyKlineLoader(BaseLoader):
     
     def read(
         self,
-        ts_code: Optional[str] = None,
+        ts_code: Optional[Union[str, List[str]]] = None,
         start_date: Optional[str] = None,
         end_date: Optional[str] = None
     ) -> pd.DataFrame:
@@ -98,7 +100,8 @@ class DailyKlineLoader(BaseLoader):
         从数据库读取日K线数据
         
         Args:
-            ts_code: 股票代码，可以是单个字符串（可选，如果不提供则读取所有股票）
+            ts_code: 股票代码，可以是单个字符串或列表（可选，如果不提供则读取所有股票）；
+                传入列表时一次查询读取多只股票，结果按 ts_code、trade_date 排序
             start_date: 开始日期 (YYYY-MM-DD 或 YYYYMMDD)（可选）
             end_date: 结束日期 (YYYY-MM-DD 或 YYYYMMDD)（可选）
             
@@ -112,7 +115,9 @@ class DailyKlineLoader(BaseLoader):
                 query = session.query(model_class)
                 
                 # 构建过滤条件
-                if ts_code is not None:
+                if isinstance(ts_code, (list, tuple)):
+                    query = query.filter(model_class.ts_code.in_(ts_code))
+                elif ts_code is not None:
                     query = query.filter(model_class.ts_code == ts_code)
                 
                 if start_date is not None:
@@ -125,23 +130,18 @@ class DailyKlineLoader(BaseLoader):
                     end_date_obj = DateHelper.parse_to_date(end_date_normalized)
                     query = query.filter(model_class.trade_date <= end_date_obj)
                 
-                # 排序
-                query = query.order_by(model_class.trade_date)
+                # 排序（多只股票时先按股票分组）
+                if isinstance(ts_code, (list, tuple)):
+                    query = query.order_by(model_class.ts_code, model_class.trade_date)
+                else:
+                    query = query.order_by(model_class.trade_date)
                 
-                results = query.all()
-                
-                if not results:
-                    return pd.DataFrame()
-                
-                # 转换为DataFrame
-                data = [DailyKlineORM._model_to_dict(row) for row in results]
-                df = pd.DataFrame(data)
-                
-                # 转换trade_date为datetime（如果存在）
-                if "trade_date" in df.columns:
-                    df["trade_date"] = pd.to_datetime(df["trade_date"], errors='coerce')
-                
-                return df
+                # 全市场或多只股票批量读取时结果集较大，分块流式读取以降低内存峰值
+                multi_stock = ts_code is None or isinstance(ts_code, (list, tuple))
+                return self._read_query(
+                    session, query,
+                    chunksize=self.READ_CHUNK_SIZE if multi_stock else None
+                )
                 
         except Exception as e:
             logger.error(f"读取日K线数据失败: {e}")
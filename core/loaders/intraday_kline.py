@@ -28,7 +28,7 @@ class IntradayKlineLoader(BaseLoader):
         Args:
             config: 配置字典，包含：
                 - table: 表名（默认 "intraday_kline"）
-                - batch_size: 批量大小（默认 1000）
+                - batch_size: 批量大小（默认 5000，分时行较窄，5000 行一次 executemany 远低于 max_allowed_packet）
                 - upsert_keys: upsert 的键（默认 ['ts_code', 'trade_date', 'time']）
         """
         if config is None:
@@ -37,6 +37,8 @@ class IntradayKlineLoader(BaseLoader):
             config['table'] = 'intraday_kline'
         if 'upsert_keys' not in config:
             config['upsert_keys'] = ['ts_code', 'trade_date', 'time']
+        if 'batch_size' not in config:
+            config['batch_size'] = 5000
         
         super().__init__(config)
     
@@ -138,20 +140,11 @@ class IntradayKlineLoader(BaseLoader):
                 # 排序
                 query = query.order_by(model_class.ts_code, model_class.trade_date, model_class.time)
                 
-                results = query.all()
-                
-                if not results:
-                    return pd.DataFrame()
-                
-                # 转换为DataFrame
-                data = [IntradayKlineORM._model_to_dict(row) for row in results]
-                df = pd.DataFrame(data)
-                
-                # 转换trade_date为datetime（如果存在）
-                if "trade_date" in df.columns:
-                    df["trade_date"] = pd.to_datetime(df["trade_date"], errors='coerce')
-                
-                return df
+                # 未指定股票时为全市场读取，分块流式读取以降低内存峰值
+                return self._read_query(
+                    session, query,
+                    chunksize=self.READ_CHUNK_SIZE if ts_code is None else None
+                )
                 
         except Exception as e:
             logger.error(f"读取分时K线数据失败: {e}")
@@ -27,7 +27,7 @@ class TradeCalendarLoader(BaseLoader):
         Args:
             config: 配置字典，包含：
                 - table: 表名（默认 "trade_calendar"）
-                - batch_size: 批量大小（默认 1000）
+                - batch_size: 批量大小（默认 10000，日历行很窄，按年回补时一次 executemany 即可写完）
                 - upsert_keys: upsert 的键（默认 ['cal_date']）
                 - preserve_null_columns: 保留NULL的列（默认所有 _open 列）
         """
@@ -37,6 +37,8 @@ class TradeCalendarLoader(BaseLoader):
             config['table'] = 'trade_calendar'
         if 'upsert_keys' not in config:
             config['upsert_keys'] = ['cal_date']
+        if 'batch_size' not in config:
+            config['batch_size'] = 10000
         if 'preserve_null_columns' not in config:
             # 默认保留所有 _open 列的现有值（如果新值为NULL）
             config['preserve_null_columns'] = [
@@ -91,6 +93,47 @@ class TradeCalendarLoader(BaseLoader):
             logger.error(f"加载交易日历数据失败: {e}")
             raise LoaderException(f"加载交易日历数据失败: {e}") from e
     
+    def has_date(self, cal_date: str, exchange: Optional[str] = None) -> bool:
+        """
+        检查数据库中是否已存在指定日期（及交易所）的交易日历
+        
+        只按主键查询一行，不读取整行、也不构建 DataFrame；
+        指定交易所时还要求该交易所的 <exchange>_open 列非 NULL
+        （同一日期的行可能只写入了部分交易所）
+        
+        Args:
+            cal_date: 日历日期 (YYYY-MM-DD 或 YYYYMMDD)
+            exchange: 交易所代码，如 SSE、SZSE（可选，不提供时只检查日期行是否存在）
+            
+        Returns:
+            bool: 是否已存在
+        """
+        from utils.date_helper import DateHelper
+        
+        try:
+            model_class = self._get_orm_model()
+            cal_date_obj = DateHelper.parse_to_date(DateHelper.normalize_to_yyyy_mm_dd(cal_date))
+            
+            query_filters = [model_class.cal_date == cal_date_obj]
+            if exchange is not None:
+                open_column = getattr(model_class, f"{exchange.lower()}_open", None)
+                if open_column is None:
+                    raise LoaderException(f"不支持的交易所: {exchange}")
+                query_filters.append(open_column.isnot(None))
+            
+            with self._get_session() as session:
+                row = (
+                    session.query(model_class.cal_date)
+                    .filter(*query_filters)
+                    .limit(1)
+                    .first()
+                )
+                return row is not None
+                
+        except Exception as e:
+            logger.error(f"检查交易日历数据失败: {e}")
+            raise LoaderException(f"检查交易日历数据失败: {e}") from e
+    
     def read(
         self,
         cal_date: Optional[str] = None,
@@ -135,27 +178,18 @@ class TradeCalendarLoader(BaseLoader):
                 # 排序
                 query = query.order_by(model_class.cal_date)
                 
-                results = query.all()
+                df = pd.read_sql(query.statement, session.connection())
                 
-                if not results:
+                if df.empty:
                     return pd.DataFrame()
                 
-                # 转换为DataFrame
-                data = []
-                for row in results:
-                    row_dict = {}
-                    for column in model_class.__table__.columns:
-                        value = getattr(row, column.name)
-                        # 处理日期类型
-                        if value is not None and hasattr(value, 'strftime'):
-                            value = DateHelper.parse_to_str(value)
-                        # 处理布尔类型
-                        elif isinstance(value, bool):
-                            value = 1 if value else 0
-                        row_dict[column.name] = value
-                    data.append(row_dict)
-                
-                df = pd.DataFrame(data)
+                # 按列整体转换，代替逐行逐列的 getattr 和日期/布尔判断：
+                # 日期列格式化为 YYYY-MM-DD 字符串，布尔列转换为 1/0（缺失值保持为空）
+                cal_date = pd.to_datetime(df['cal_date'], errors='coerce')
+                df['cal_date'] = cal_date.dt.strftime('%Y-%m-%d').where(cal_date.notna(), None)
+                open_columns = [col for col in df.columns if col.endswith('_open')]
+                for col in open_columns:
+                    df[col] = df[col].map({True: 1, False: 0})
                 
                 logger.debug(f"从数据库读取到 {len(df)} 条交易日历数据")
                 return df
@@ -32,8 +32,9 @@ class DailyKlineORM(Base):
     low_qfq = Column(DECIMAL(10, 2), nullable=True, comment='前复权最低价（元，精确到分）')
     
     __table_args__ = (
+        # 联合主键 (ts_code, trade_date) 即 InnoDB 聚簇索引，叶子节点存整行：
+        # 按股票过滤、按日期排序的查询直接走主键，无需单独的 ts_code 前缀索引
         PrimaryKeyConstraint('ts_code', 'trade_date'),
-        Index('idx_ts_code', 'ts_code'),
         Index('idx_trade_date', 'trade_date'),
         {'comment': '日线行情数据表（未复权原始数据 + 前复权价格）'}
     )
@@ -91,7 +92,6 @@ class TradeCalendarORM(Base):
     
     __table_args__ = (
         PrimaryKeyConstraint('cal_date'),
-        Index('idx_calendar_date', 'cal_date'),
         {'comment': '交易日历表'}
     )
 
@@ -106,7 +106,6 @@ class AdjFactorORM(Base):
 
     __table_args__ = (
         PrimaryKeyConstraint('ts_code', 'trade_date'),
-        Index('idx_adj_factor_ts_code', 'ts_code'),
         Index('idx_adj_factor_date', 'trade_date'),
         {'comment': '复权因子表（仅存储除权除息日的复权因子）'}
     )
@@ -141,7 +140,6 @@ class IntradayKlineORM(Base):
     
     __table_args__ = (
         PrimaryKeyConstraint('ts_code', 'trade_date', 'time'),
-        Index('idx_intraday_ts_code', 'ts_code'),
         Index('idx_intraday_trade_date', 'trade_date'),
         Index('idx_intraday_datetime', 'datetime'),
         {'comment': '分时K线数据表'}
@@ -27,6 +27,12 @@ class DailyPipeline(BasePipeline):
     注意：实时K线数据更新已移至 StrategyPipeline
     """
 
+    # 交易日历更新的交易所范围，"ALL" 表示同时更新上交所和深交所
+    CALENDAR_EXCHANGES = ["SSE", "SZSE"]
+
+    # 进程内已确认日历齐全的 (日期, 交易所) 集合，守护进程中多次运行时不再重复检查
+    _calendar_up_to_date = set()
+
     def __init__(self):
         super().__init__()
 
@@ -44,6 +50,7 @@ class DailyPipeline(BasePipeline):
             update_daily_kline: 是否更新日K线数据（默认 True）
             update_adj_factor: 是否更新复权因子（默认 True）
             update_qfq_data: 是否更新前复权数据（默认 True）
+            calendar_exchange: 交易日历的交易所代码（默认 "SSE"，"ALL" 表示上交所和深交所）
             **kwargs: 其他参数
         """
         trade_date = DateHelper.today()
@@ -56,6 +63,7 @@ class DailyPipeline(BasePipeline):
         update_daily_kline = kwargs.get("update_daily_kline", True)
         update_adj_factor = kwargs.get("update_adj_factor", True)
         update_qfq_data = kwargs.get("update_qfq_data", True)
+        calendar_exchange = kwargs.get("calendar_exchange", "SSE")
 
         if update_basic_info:
             logger.info("-" * 60)
@@ -68,7 +76,7 @@ class DailyPipeline(BasePipeline):
             logger.info("-" * 60)
             logger.info("步骤 2: 更新交易日历 (trade_calendar)")
             logger.info("-" * 60)
-            self._update_trade_calendar(trade_date)
+            self._update_trade_calendar(trade_date, exchange=calendar_exchange)
 
         # 检查是否为交易日
         if not self._is_trading_day(trade_date):
@@ -237,22 +245,45 @@ class DailyPipeline(BasePipeline):
             logger.error(f"更新股票基本信息数据失败，错误:{e}")
             raise
 
-    def _update_trade_calendar(self, trade_date: str) -> None:
+    def _update_trade_calendar(self, trade_date: str, exchange: str = "SSE") -> None:
         """
         更新交易日历数据
 
+        只采集 exchange 指定的交易所；本进程内已确认过的（日期, 交易所）直接跳过，
+        数据库中该日期已有某交易所的日历时，也不再重复采集该交易所
+
         Args: 
             trade_date: 交易日 (YYYY-MM-DD)
+            exchange: 交易所代码（默认 "SSE"，"ALL" 表示上交所和深交所）
         """
+        exchanges = self.CALENDAR_EXCHANGES if exchange == "ALL" else [exchange]
+        pending = [ex for ex in exchanges if (trade_date, ex) not in self._calendar_up_to_date]
+        if not pending:
+            logger.debug(f"交易日历已是最新（本进程内已检查），跳过更新，日期:{trade_date}")
+            return
+
         try:
-            logger.info(f"更新交易日历数据，日期:{trade_date}")
+            # 逐个交易所检查：同一日期的行可能只写入了部分交易所，只跳过已有数据的交易所
+            stored = [ex for ex in pending if self.trade_calendar_loader.has_date(trade_date, exchange=ex)]
+            self._calendar_up_to_date.update((trade_date, ex) for ex in stored)
+            pending = [ex for ex in pending if ex not in stored]
+            if not pending:
+                logger.info(f"数据库中已存在交易日历，跳过更新，日期:{trade_date}")
+                return
 
-            raw_data = self.trade_calendar_collector.collect(start_date=trade_date, end_date=trade_date)
+            logger.info(f"更新交易日历数据，日期:{trade_date}，交易所:{pending}")
 
-            if raw_data is None or raw_data.empty:
+            raw_frames = []
+            for ex in pending:
+                raw_data = self.trade_calendar_collector.collect(start_date=trade_date, end_date=trade_date, exchange=ex)
+                if raw_data is not None and not raw_data.empty:
+                    raw_frames.append(raw_data)
+
+            if not raw_frames:
                 logger.warning(f"未采集到交易日历数据，日期:{trade_date}")
                 return
             
+            raw_data = pd.concat(raw_frames, ignore_index=True) if len(raw_frames) > 1 else raw_frames[0]
             transformed_data = self.trade_calendar_transformer.transform(raw_data)
 
             if transformed_data is None or transformed_data.empty:
@@ -260,6 +291,7 @@ class DailyPipeline(BasePipeline):
                 return 
 
             self.trade_calendar_loader.load(transformed_data, strategy=BaseLoader.LOAD_STRATEGY_UPSERT)
+            self._calendar_up_to_date.update((trade_date, ex) for ex in pending)
 
         except Exception as e:
             logger.error(f"更新交易日历数据失败，日期:{trade_date}，错误:{e}")
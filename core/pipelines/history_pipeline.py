@@ -4,12 +4,15 @@
 负责补全历史股票数据
 """
 
-from typing import Any, Dict, List, Optional
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
 import pandas as pd
 from loguru import logger
-from concurrent.futures import ThreadPoolExecutor, as_completed, CancelledError
+from concurrent.futures import ThreadPoolExecutor, as_completed, wait, FIRST_COMPLETED, FIRST_EXCEPTION
+from collections import Counter
+from itertools import islice
 import math
 import signal
+import threading
 import sys
 
 from tqdm import tqdm
@@ -20,7 +23,8 @@ from core.pipelines.base import BasePipeline
 from core.collectors.base import BaseCollector
 from core.transformers.base import BaseTransformer
 from core.loaders.base import BaseLoader
-from core.common.exceptions import PipelineException
+from core.common.exceptions import PipelineException, TransformerException
+from core.common.utils import merge_dataframes
 
 # 导入各个数据源的组件
 from core.collectors.basic_info import BasicInfoCollector
@@ -52,14 +56,44 @@ class HistoryPipeline(BasePipeline):
     2. 更新 trade_calendar（交易日历，依赖日期范围）
     3. 更新 daily_kline（日K线数据，依赖股票代码和日期范围）
     4. 更新 adj_factor（复权因子，依赖股票代码和日期范围）
+    
+    并发模型：
+    - 按日期采集在调用线程中执行；按股票采集（复权因子）由 FETCH_WORKERS 个线程并发请求，
+      调用频率由 TushareProvider 的令牌桶限流器统一控制
+    - 写入统一提交到唯一的 write_executor
+    - 在途采集任务数受 MAX_PENDING_FETCHES 限制，在途写入任务数受 MAX_PENDING_WRITES 限制，
+      采集与写入重叠进行且内存占用有上界
     """
     
+    # 按股票逐个处理时，每处理多少只股票检查一次失败率
+    FAIL_FAST_CHECK_INTERVAL = 100
+    # 判定失败率所需的最少已处理股票数，避免前几只股票失败就误判为大面积失败
+    FAIL_FAST_MIN_SAMPLES = 50
+    # 已处理股票中失败比例超过该阈值时提前终止（如 token 失效导致全部失败）
+    FAIL_FAST_RATIO = 0.8
+    # 按股票采集时的并发请求线程数（实际调用频率仍受 TUSHARE_RATE_LIMIT / TUSHARE_MAX_CONCURRENCY 限制）
+    FETCH_WORKERS = 4
+    # 同时在途（排队 + 请求中 + 已完成未消费）的采集任务上限，已消费的结果不再被持有
+    MAX_PENDING_FETCHES = FETCH_WORKERS * 2
+    # 写入线程数：批量写入后任务数少而大，多线程同时写同一张表只会争抢行锁/间隙锁（UPSERT 易死锁）
+    WRITE_WORKERS = 2
+    # 同时在途（排队 + 执行中）的写入任务上限，避免所有 DataFrame 堆积在内存中
+    MAX_PENDING_WRITES = 40
+    # 按股票/按日期逐个采集时，累计到该行数再合并为一次写入（一个事务），减少事务和提交次数
+    WRITE_BATCH_ROWS = 20000
+    
     def __init__(self):
         """
         初始化历史数据补全流水线
         """
-        self.write_executor = ThreadPoolExecutor(max_workers=15, thread_name_prefix="write_thread")
-        self.pending_writes = []
+        self.write_executor = ThreadPoolExecutor(max_workers=self.WRITE_WORKERS, thread_name_prefix="write_thread")
+        # 在途写入任务 {future: 描述}，任务完成后由回调立即移除，已完成的任务不会一直被持有
+        self.pending_writes: Dict[Any, str] = {}
+        self._pending_lock = threading.Lock()
+        self._write_failures = 0
+        self._write_slots = threading.BoundedSemaphore(self.MAX_PENDING_WRITES)
+        # 上市股票代码列表缓存（首次从 API 获取后复用）
+        self._listed_ts_codes: Optional[List[str]] = None
         self._shutdown_requested = False
         
         # 注册信号处理器，用于优雅关闭
@@ -84,7 +118,9 @@ class HistoryPipeline(BasePipeline):
         
         logger.info("正在关闭写入线程池...")
         # 取消所有未开始的任务
-        for future, desc in self.pending_writes:
+        with self._pending_lock:
+            pending = list(self.pending_writes.items())
+        for future, desc in pending:
             if not future.done():
                 future.cancel()
                 logger.debug(f"已取消任务: {desc}")
@@ -104,10 +140,10 @@ class HistoryPipeline(BasePipeline):
         执行历史数据补全流水线
         
         Args:
-            stock_codes: 股票代码列表
             start_date: 开始日期 (YYYY-MM-DD 或 YYYYMMDD)
             end_date: 结束日期 (YYYY-MM-DD 或 YYYYMMDD)
             **kwargs: 其他参数
+                - ts_codes: List[str], 调用方已获取的股票代码列表（可选，提供时复权因子和前复权步骤不再重复查询股票列表）
                 - update_basic_info: bool, 是否更新 basic_info（默认 True）
                 - update_trade_calendar: bool, 是否更新 trade_calendar（默认 True）
                 - update_daily_kline: bool, 是否更新 daily_kline（默认 True）
@@ -134,6 +170,7 @@ class HistoryPipeline(BasePipeline):
             update_daily_kline = kwargs.get("update_daily_kline", True)
             update_adj_factor = kwargs.get("update_adj_factor", True)
             update_qfq_data = kwargs.get("update_qfq_data", True)
+            ts_codes = kwargs.get("ts_codes")
             
             if update_basic_info:
                 logger.info("-" * 60)
@@ -160,13 +197,13 @@ class HistoryPipeline(BasePipeline):
                 logger.info("-" * 60)
                 logger.info("步骤 4: 更新复权因子 (adj_factor)")
                 logger.info("-" * 60)
-                self._update_adj_factor(start_date_api, end_date_api)
+                self._update_adj_factor(start_date_api, end_date_api, ts_codes=ts_codes)
             
             if update_qfq_data:
                 logger.info("-" * 60)
                 logger.info("步骤 5: 更新前复权数据 (qfq_data)")
                 logger.info("-" * 60)
-                self._update_qfq_data()
+                self._update_qfq_data(ts_codes=ts_codes)
 
 
             logger.info("等待写入完成...")
@@ -205,6 +242,8 @@ class HistoryPipeline(BasePipeline):
                 return
             
             logger.info(f"✓ 采集完成，数据量: {len(raw_data)} 条")
+            # 复用本次采集结果，后续按股票更新的步骤无需再次请求 stock_basic
+            self._listed_ts_codes = raw_data['ts_code'].tolist()
             
             # 2. Transform - 转换数据
             logger.info("转换股票基本信息...")
@@ -225,6 +264,19 @@ class HistoryPipeline(BasePipeline):
             logger.error(f"更新股票基本信息失败: {e}")
             raise
     
+    def _get_listed_ts_codes(self) -> List[str]:
+        """
+        获取上市股票代码列表（带缓存）
+        
+        优先复用 _update_basic_info 采集到的结果，未执行该步骤时才请求一次 API
+        
+        Returns:
+            List[str]: 股票代码列表
+        """
+        if self._listed_ts_codes is None:
+            self._listed_ts_codes = self.basic_info_collector.get_all_ts_codes()
+        return self._listed_ts_codes
+    
     def _update_trade_calendar(self, start_date: str, end_date: str) -> None:
         """
         更新交易日历
@@ -276,12 +328,11 @@ class HistoryPipeline(BasePipeline):
             end_date: 结束日期 (YYYYMMDD)
         """
         try:
-            # 异步线程池
-            start_date = DateHelper.parse_to_date(start_date)
-            end_date = DateHelper.parse_to_date(end_date)
-            len_date_range = (end_date - start_date).days + 1
-            with tqdm(total= len_date_range, desc="采集日K线数据") as pbar:
-                for trade_date in pd.date_range(start_date, end_date):
+            trade_dates = self._get_trade_dates(start_date, end_date)
+            write_buffer = []
+            buffer_rows = 0
+            with tqdm(total=len(trade_dates), desc="采集日K线数据") as pbar:
+                for trade_date in trade_dates:
                     # 检查是否收到关闭请求
                     if self._shutdown_requested:
                         logger.warning("收到关闭请求，停止采集数据")
@@ -298,63 +349,164 @@ class HistoryPipeline(BasePipeline):
                         pbar.update(1)
                         continue
                     
-                    future = self.write_executor.submit(self.daily_kline_loader.load, transformed_data, BaseLoader.LOAD_STRATEGY_APPEND)
-                    self.pending_writes.append((future, f"日期: {trade_date_str} daily kline数据写入"))
+                    # 多个交易日合并为一次写入（一个事务），而不是每天单独提交
+                    write_buffer.append(transformed_data)
+                    buffer_rows += len(transformed_data)
+                    if buffer_rows >= self.WRITE_BATCH_ROWS:
+                        self._flush_write_buffer(write_buffer, self.daily_kline_loader, BaseLoader.LOAD_STRATEGY_APPEND, "daily kline", key_column="trade_date")
+                        buffer_rows = 0
                     pbar.update(1)
+            
+            if write_buffer:
+                self._flush_write_buffer(write_buffer, self.daily_kline_loader, BaseLoader.LOAD_STRATEGY_APPEND, "daily kline", key_column="trade_date")
         except Exception as e:
             logger.error(f"更新日K线数据失败: {e}")
             raise
     
-    def _update_adj_factor(self, start_date: str, end_date: str) -> None:
+    def _get_trade_dates(self, start_date: str, end_date: str) -> pd.DatetimeIndex:
+        """
+        获取日期范围内的交易日（SSE 或 SZSE 开市）
+        
+        一次读取整段交易日历并用向量化掩码筛选，避免对周末、节假日逐日调用 API；
+        交易日历缺失时退回到自然日范围
+        
+        Args:
+            start_date: 开始日期 (YYYYMMDD)
+            end_date: 结束日期 (YYYYMMDD)
+        
+        Returns:
+            pd.DatetimeIndex: 交易日列表（升序）
+        """
+        all_dates = pd.date_range(DateHelper.parse_to_date(start_date), DateHelper.parse_to_date(end_date))
+        try:
+            calendar_df = self.trade_calendar_loader.read(start_date=start_date, end_date=end_date)
+        except Exception as e:
+            logger.warning(f"读取交易日历失败，按自然日逐日采集: {e}")
+            return all_dates
+        
+        if calendar_df is None or calendar_df.empty:
+            logger.warning("交易日历为空，按自然日逐日采集")
+            return all_dates
+        
+        cal_dates = pd.DatetimeIndex(pd.to_datetime(calendar_df['cal_date']))
+        is_open = calendar_df[['sse_open', 'szse_open']].fillna(0).astype(bool).any(axis=1).to_numpy()
+        # 交易日历未覆盖的日期无法判断，仍按自然日采集
+        uncovered = all_dates[~all_dates.isin(cal_dates)]
+        trade_dates = cal_dates[is_open].union(uncovered).sort_values()
+        logger.info(f"日期范围内共 {len(all_dates)} 个自然日，需采集 {len(trade_dates)} 天（跳过 {len(all_dates) - len(trade_dates)} 个休市日）")
+        return trade_dates
+    
+    def _update_adj_factor(self, start_date: str, end_date: str, ts_codes: Optional[List[str]] = None) -> None:
         """
         更新复权因子
         
         Args:
-            stock_codes: 股票代码列表
             start_date: 开始日期 (YYYYMMDD)
             end_date: 结束日期 (YYYYMMDD)
+            ts_codes: 股票代码列表（可选，为 None 时使用缓存的上市股票列表）
         """
         try:
             # 1. Extract - 采集数据
             logger.info(f"采集复权因子数据 日期范围: {start_date} ~ {end_date}...")
 
-            ts_code_list = self.basic_info_collector.get_all_ts_codes()
+            ts_code_list = ts_codes if ts_codes is not None else self._get_listed_ts_codes()
+            # 本步骤提交的写入任务 {future: 该批包含的股票数}
+            step_writes: Dict[Any, int] = {}
+            fetch_errors = []
+            write_buffer = []
+            buffer_rows = 0
             
-            # 复权因子需要按股票代码逐个采集
-            with tqdm(total=len(ts_code_list), desc="采集复权因子数据") as pbar:
-                for ts_code in ts_code_list:
-                    # 检查是否收到关闭请求
-                    if self._shutdown_requested:
-                        logger.warning("收到关闭请求，停止采集数据")
-                        break
-                    
-                    try:
-                        raw_data = self.adj_factor_collector.get_single_stock_adj_factor(ts_code)
-                        if raw_data is None or raw_data.empty:
-                            pbar.update(1)
+            # 复权因子需要按股票代码逐个采集：多线程并发请求，调用频率由 provider 的限流器统一控制
+            fetch_executor = ThreadPoolExecutor(max_workers=self.FETCH_WORKERS, thread_name_prefix="fetch_thread")
+            try:
+                fetch_results = self._iter_bounded_fetches(
+                    fetch_executor, self.adj_factor_collector.get_single_stock_adj_factor, ts_code_list
+                )
+                with tqdm(total=len(ts_code_list), desc="采集复权因子数据") as pbar:
+                    for i, (ts_code, future) in enumerate(fetch_results, 1):
+                        # 检查是否收到关闭请求
+                        if self._shutdown_requested:
+                            logger.warning("收到关闭请求，停止采集数据")
+                            break
+                        
+                        if i % self.FAIL_FAST_CHECK_INTERVAL == 0:
+                            self._check_fail_fast(step_writes, fetch_errors, i - 1, "复权因子")
+                        
+                        pbar.update(1)
+                        try:
+                            raw_data = future.result()
+                        except Exception as e:
+                            logger.warning(f"采集股票 {ts_code} 的复权因子失败: {e}")
+                            fetch_errors.append(e)
                             continue
-                        transformed_data = self.adj_factor_transformer.transform(raw_data)
-                        if transformed_data is None or transformed_data.empty:
-                            pbar.update(1)
+                        
+                        if raw_data is None or raw_data.empty:
                             continue
-                        future = self.write_executor.submit(self.adj_factor_loader.load, transformed_data, BaseLoader.LOAD_STRATEGY_UPSERT)
-                        self.pending_writes.append((future, f"股票: {ts_code} adj factor数据写入"))
-                        pbar.update(1)
-                    except Exception as e:
-                        logger.warning(f"采集股票 {ts_code} 的复权因子失败: {e}")
-                        pbar.update(1)
+                        # 原始数据先缓冲，刷写时整批转换校验一次，而不是每只股票转换一次
+                        write_buffer.append(raw_data)
+                        buffer_rows += len(raw_data)
+                        
+                        if buffer_rows >= self.WRITE_BATCH_ROWS:
+                            self._flush_write_buffer(write_buffer, self.adj_factor_loader, BaseLoader.LOAD_STRATEGY_UPSERT, "adj factor", transformer=self.adj_factor_transformer, step_writes=step_writes)
+                            buffer_rows = 0
+            finally:
+                # 中断或提前终止时取消尚未开始的采集任务，只等待正在进行的请求结束
+                fetch_executor.shutdown(wait=True, cancel_futures=True)
+            
+            if write_buffer:
+                self._flush_write_buffer(write_buffer, self.adj_factor_loader, BaseLoader.LOAD_STRATEGY_UPSERT, "adj factor", transformer=self.adj_factor_transformer, step_writes=step_writes)
         except Exception as e:
             logger.error(f"更新复权因子失败: {e}")
             raise
 
+    def _iter_bounded_fetches(
+        self,
+        executor: ThreadPoolExecutor,
+        fetch_func: Callable[[str], pd.DataFrame],
+        ts_codes: List[str]
+    ) -> Iterator[Tuple[str, Any]]:
+        """
+        按完成顺序逐个产出采集任务，同时在途的任务数不超过 MAX_PENDING_FETCHES
+        
+        每产出一个已完成的任务就补充提交新的任务；产出后不再持有该任务，
+        调用方处理完结果即可被回收，而不是所有股票的原始数据在整个步骤中常驻内存。
+        
+        Args:
+            executor: 采集线程池
+            fetch_func: 按股票代码采集数据的函数
+            ts_codes: 股票代码列表
+        
+        Yields:
+            (ts_code, future): 股票代码及其已完成的采集任务
+        """
+        pending_codes = iter(ts_codes)
+        in_flight: Dict[Any, str] = {}
+        while True:
+            for ts_code in islice(pending_codes, self.MAX_PENDING_FETCHES - len(in_flight)):
+                in_flight[executor.submit(fetch_func, ts_code)] = ts_code
+            if not in_flight:
+                return
+            done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+            for future in done:
+                yield in_flight.pop(future), future
+
     def _update_qfq_data(
         self,
+        ts_codes: Optional[List[str]] = None,
     ) -> None:
-        ts_codes = self.basic_info_loader.get_all_ts_codes()
+        # 调用方已提供股票列表时直接使用，避免重复查询数据库
+        if ts_codes is None:
+            ts_codes = self.basic_info_loader.get_all_ts_codes()
         qfq_calculator = QFQCalculator()
+        # 本步骤提交的写入任务 {future: 该批包含的股票数}
+        step_writes: Dict[Any, int] = {}
+        write_buffer = []
+        buffer_rows = 0
         try:
             with tqdm(total=len(ts_codes), desc="更新前复权数据") as pbar:
-                for ts_code in ts_codes:
+                for i, ts_code in enumerate(ts_codes, 1):
+                    if i % self.FAIL_FAST_CHECK_INTERVAL == 0:
+                        self._check_fail_fast(step_writes, [], i - 1, "前复权数据")
                     adj_factor_df = self.adj_factor_loader.read(ts_code=ts_code)
                     daily_kline_df = self.daily_kline_loader.read(ts_code=ts_code)
                     if daily_kline_df is None or daily_kline_df.empty:
@@ -365,45 +517,192 @@ class HistoryPipeline(BasePipeline):
                         logger.warning(f"股票 {ts_code} 没有前复权数据")
                         continue
                     
-                    future = self.write_executor.submit(self.daily_kline_loader.load, qfq_calculator_df, BaseLoader.LOAD_STRATEGY_UPSERT)
-                    self.pending_writes.append((future, f"股票: {ts_code} qfq数据写入"))
+                    write_buffer.append(qfq_calculator_df)
+                    buffer_rows += len(qfq_calculator_df)
+                    if buffer_rows >= self.WRITE_BATCH_ROWS:
+                        self._flush_write_buffer(write_buffer, self.daily_kline_loader, BaseLoader.LOAD_STRATEGY_UPSERT, "qfq", step_writes=step_writes)
+                        buffer_rows = 0
                     pbar.update(1)
+            
+            if write_buffer:
+                self._flush_write_buffer(write_buffer, self.daily_kline_loader, BaseLoader.LOAD_STRATEGY_UPSERT, "qfq", step_writes=step_writes)
         except Exception as e:
             logger.error(f"更新前复权数据失败: {e}")
             raise
 
+    def _submit_write(self, loader: BaseLoader, data: pd.DataFrame, strategy: str, desc: str):
+        """
+        提交写入任务到写入线程池（有界）
+        
+        在途写入任务达到 MAX_PENDING_WRITES 时阻塞调用线程，直到有任务完成（或被取消）
+        释放名额，使采集速度与写入速度匹配，已完成任务的 DataFrame 可被及时回收。
+        
+        Args:
+            loader: 数据加载器
+            data: 待写入数据
+            strategy: 加载策略
+            desc: 任务描述（用于日志）
+        
+        Returns:
+            Future: 写入任务
+        """
+        self._write_slots.acquire()
+        try:
+            future = self.write_executor.submit(loader.load, data, strategy)
+        except Exception:
+            self._write_slots.release()
+            raise
+        with self._pending_lock:
+            self.pending_writes[future] = desc
+        future.add_done_callback(self._on_write_done)
+        return future
+
+    def _on_write_done(self, future) -> None:
+        """
+        写入任务完成回调（在写入线程中执行）
+        
+        释放在途名额，记录失败日志，并从 pending_writes 中移除该任务
+        """
+        self._write_slots.release()
+        with self._pending_lock:
+            desc = self.pending_writes.pop(future, "未知任务")
+        
+        if future.cancelled():
+            logger.debug(f"任务已取消: {desc}")
+            return
+        error = future.exception()
+        if error is not None:
+            with self._pending_lock:
+                self._write_failures += 1
+            logger.error(f"写入失败 ({desc}): {error}")
+
+    def _flush_write_buffer(
+        self,
+        write_buffer: List[pd.DataFrame],
+        loader: BaseLoader,
+        strategy: str,
+        name: str,
+        key_column: str = "ts_code",
+        transformer: Optional[BaseTransformer] = None,
+        step_writes: Optional[Dict[Any, int]] = None
+    ):
+        """
+        将缓冲的多批数据（多只股票或多个交易日）合并为一次写入任务提交，并清空缓冲区
+        
+        Args:
+            write_buffer: 待写入的 DataFrame 列表（提交后原地清空）
+            loader: 数据加载器
+            strategy: 加载策略
+            name: 数据名称（用于任务描述）
+            key_column: 每批数据的标识列（ts_code 或 trade_date，用于任务描述）
+            transformer: 如果提供，缓冲区中为原始数据，合并后整批转换一次；
+                整批转换失败时退回逐批转换，仅跳过出错的那一批
+            step_writes: 如果提供，将提交的写入任务及其包含的批数登记到该字典（用于失败率统计）
+        
+        Returns:
+            Future: 写入任务（转换后无数据时返回 None）
+        """
+        first_key = write_buffer[0][key_column].iloc[0]
+        last_key = write_buffer[-1][key_column].iloc[0]
+        batch_count = len(write_buffer)
+        batch = merge_dataframes(write_buffer)
+        
+        if transformer is not None:
+            try:
+                batch = transformer.transform(batch)
+            except TransformerException as e:
+                logger.warning(f"整批转换 {name} 数据失败，改为逐批转换: {e}")
+                transformed = []
+                for raw_data in write_buffer:
+                    try:
+                        transformed.append(transformer.transform(raw_data))
+                    except TransformerException as item_error:
+                        logger.warning(f"转换 {raw_data[key_column].iloc[0]} 的 {name} 数据失败: {item_error}")
+                transformed = [df for df in transformed if df is not None and not df.empty]
+                batch = merge_dataframes(transformed)
+        
+        write_buffer.clear()
+        if batch is None or batch.empty:
+            return None
+        
+        desc = f"{key_column}: {first_key} ~ {last_key} ({batch_count} 批, {len(batch)} 条) {name}数据写入"
+        future = self._submit_write(loader, batch, strategy, desc)
+        if step_writes is not None:
+            step_writes[future] = batch_count
+        return future
+
+    def _check_fail_fast(
+        self,
+        step_writes: Dict[Any, int],
+        fetch_errors: List[Exception],
+        processed: int,
+        step_name: str
+    ) -> None:
+        """
+        检查已处理股票的失败率，大面积失败时提前终止
+        
+        非阻塞地检查已提交的写入任务（timeout=0），失败的写入按其包含的股票数计入，
+        再加上采集阶段失败的股票；分母为已处理的全部股票（成功、无数据和失败）。
+        已处理股票数不少于 FAIL_FAST_MIN_SAMPLES 且失败比例超过 FAIL_FAST_RATIO 时，
+        取消尚未开始的任务并抛出异常，避免在 token 失效、数据库不可用等情况下
+        继续对几千只股票逐个失败。
+        
+        Args:
+            step_writes: 本步骤已提交的写入任务 {future: 该批包含的股票数}
+            fetch_errors: 本步骤采集阶段捕获的异常（每只失败的股票一个）
+            processed: 本步骤已处理的股票数
+            step_name: 步骤名称（用于日志）
+        
+        Raises:
+            PipelineException: 失败比例超过阈值时抛出
+        """
+        if processed < self.FAIL_FAST_MIN_SAMPLES:
+            return
+        
+        futures = list(step_writes)
+        done, not_done = wait(futures, timeout=0, return_when=FIRST_EXCEPTION) if futures else (set(), set())
+        failed_writes = [f for f in done if not f.cancelled() and f.exception() is not None]
+        errors = list(fetch_errors) + [f.exception() for f in failed_writes]
+        failed = len(fetch_errors) + sum(step_writes[f] for f in failed_writes)
+        
+        if not errors or failed / processed <= self.FAIL_FAST_RATIO:
+            return
+        
+        for future in not_done:
+            future.cancel()
+        
+        error_type, count = Counter(type(e).__name__ for e in errors).most_common(1)[0]
+        message = (
+            f"{step_name}大面积失败，提前终止: {failed}/{processed} 只股票失败，"
+            f"最常见异常 {error_type} ({count} 次): {errors[0]}"
+        )
+        logger.error(message)
+        raise PipelineException(message)
 
 
     def _wait_write_task_finish(self):
-        """等待所有写入任务完成，支持中断"""
-        if not self.pending_writes:
+        """等待所有在途写入任务完成，支持中断（结果和错误已由完成回调处理）"""
+        with self._pending_lock:
+            pending = list(self.pending_writes)
+        if not pending:
             return
         
-        with tqdm(total=len(self.pending_writes), desc="等待写入完成", unit="批", leave=False) as pbar:
+        with tqdm(total=len(pending), desc="等待写入完成", unit="批", leave=False) as pbar:
             try:
-                # 使用 as_completed 来等待任务完成，支持中断检查
-                for future in as_completed([f for f, _ in self.pending_writes]):
+                for _ in as_completed(pending):
                     # 检查是否收到关闭请求
                     if self._shutdown_requested:
                         logger.warning("收到关闭请求，停止等待写入任务")
                         break
-                    
-                    # 找到对应的描述
-                    desc = next((d for f, d in self.pending_writes if f == future), "未知任务")
-                    try:
-                        future.result()
-                        pbar.update(1)
-                    except CancelledError:
-                        logger.debug(f"任务已取消: {desc}")
-                        pbar.update(1)
-                    except Exception as e:
-                        logger.error(f"写入失败 ({desc}): {e}")
-                        pbar.update(1)
+                    pbar.update(1)
             except KeyboardInterrupt:
                 logger.warning("用户中断，正在关闭...")
                 self._shutdown_requested = True
             except Exception as e:
                 logger.debug(f"等待任务时出现异常: {e}")
+        
+        if self._write_failures:
+            logger.warning(f"共有 {self._write_failures} 个写入任务失败，详见上方错误日志")
 
     def run_single_stock(self, ts_code: str, start_date: str, end_date: str, **kwargs) -> None:
         """
@@ -515,12 +814,7 @@ class HistoryPipeline(BasePipeline):
             
             # 加载数据（使用异步写入）
             logger.info("加载日K线数据到数据库...")
-            future = self.write_executor.submit(
-                self.daily_kline_loader.load, 
-                transformed_data, 
-                BaseLoader.LOAD_STRATEGY_APPEND
-            )
-            self.pending_writes.append((future, f"股票: {ts_code} daily kline数据写入"))
+            future = self._submit_write(self.daily_kline_loader, transformed_data, BaseLoader.LOAD_STRATEGY_APPEND, f"股票: {ts_code} daily kline数据写入")
             logger.info(f"✓ 已提交写入任务，共 {len(transformed_data)} 条记录")
             
         except Exception as e:
@@ -558,12 +852,7 @@ class HistoryPipeline(BasePipeline):
             
             # 加载数据（使用异步写入）
             logger.info("加载复权因子数据到数据库...")
-            future = self.write_executor.submit(
-                self.adj_factor_loader.load, 
-                transformed_data, 
-                BaseLoader.LOAD_STRATEGY_UPSERT
-            )
-            self.pending_writes.append((future, f"股票: {ts_code} adj factor数据写入"))
+            future = self._submit_write(self.adj_factor_loader, transformed_data, BaseLoader.LOAD_STRATEGY_UPSERT, f"股票: {ts_code} adj factor数据写入")
             logger.info(f"✓ 已提交写入任务，共 {len(transformed_data)} 条记录")
             
         except Exception as e:
@@ -604,12 +893,7 @@ class HistoryPipeline(BasePipeline):
             
             # 加载数据（使用异步写入）
             logger.info("加载前复权数据到数据库...")
-            future = self.write_executor.submit(
-                self.daily_kline_loader.load, 
-                qfq_calculator_df, 
-                BaseLoader.LOAD_STRATEGY_UPSERT
-            )
-            self.pending_writes.append((future, f"股票: {ts_code} qfq数据写入"))
+            future = self._submit_write(self.daily_kline_loader, qfq_calculator_df, BaseLoader.LOAD_STRATEGY_UPSERT, f"股票: {ts_code} qfq数据写入")
             logger.info(f"✓ 已提交写入任务，共 {len(qfq_calculator_df)} 条记录")
             
         except Exception as e:
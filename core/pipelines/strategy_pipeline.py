@@ -392,11 +392,8 @@ class StrategyPipeline(BasePipeline):
                 return
             
             # 提取股票代码和名称
-            stocks = []
-            for _, row in result_df.iterrows():
-                ts_code = row['ts_code']
-                name = row.get('name', '未知')
-                stocks.append(f"{name}({ts_code})")
+            names = result_df['name'] if 'name' in result_df.columns else ['未知'] * len(result_df)
+            stocks = [f"{name}({ts_code})" for ts_code, name in zip(result_df['ts_code'], names)]
             
             # 构建消息内容
             stock_count = len(stocks)
@@ -293,8 +293,8 @@ def process_batch_stocks_complete(
     
     在子进程中完成从数据读取到策略筛选的完整流程，复用同一个策略实例处理多只股票：
     1. 创建一次策略实例
-    2. 循环处理每只股票：
-       - 读取历史K线数据
+    2. 一次查询读取整批股票的历史K线数据
+    3. 循环处理每只股票：
        - 读取实时K线数据
        - 聚合实时K线为日K线
        - 拼接历史数据和当天数据
@@ -324,15 +324,22 @@ def process_batch_stocks_complete(
         # 2. 创建策略实例（只创建一次，复用）
         strategy = strategy_class(**strategy_params)
         
-        # 3. 循环处理每只股票
+        # 3. 一次查询读取整批股票的历史K线数据（包含今天的数据），按股票拆分，
+        #    代替每只股票各查询一次数据库
+        batch_historical_df = daily_kline_loader.read(
+            ts_code=list(ts_codes),
+            start_date=start_date,
+            end_date=end_date
+        )
+        historical_by_code = (
+            {code: group.reset_index(drop=True) for code, group in batch_historical_df.groupby('ts_code', sort=False)}
+            if not batch_historical_df.empty else {}
+        )
+        
+        # 4. 循环处理每只股票
         for ts_code in ts_codes:
             try:
-                # 读取历史K线数据（包含今天的数据）
-                historical_df = daily_kline_loader.read(
-                    ts_code=ts_code,
-                    start_date=start_date,
-                    end_date=end_date
-                )
+                historical_df = historical_by_code.get(ts_code, pd.DataFrame())
                 
                 if historical_df.empty:
                     results.append(None)
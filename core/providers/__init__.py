@@ -1,4 +1,5 @@
 from .base_provider import BaseProvider
+from .rate_limiter import TokenBucketRateLimiter
 from .tushare_provider import TushareProvider
 
-__all__ = ["BaseProvider", "TushareProvider"]
+__all__ = ["BaseProvider", "TokenBucketRateLimiter", "TushareProvider"]
@@ -0,0 +1,73 @@
+"""
+令牌桶限流器
+
+用于限制数据源 API 的调用频率（如 Tushare 按每分钟调用次数限流），
+允许多个线程并发调用，只要总调用速率不超过限制。
+"""
+
+import threading
+import time
+from typing import Optional
+
+
+class TokenBucketRateLimiter:
+    """
+    令牌桶限流器（线程安全）
+
+    令牌以 rate / period 的速度持续补充，桶容量为 capacity。
+    每次调用 acquire() 消耗一个令牌，令牌不足时预支令牌（余额可为负）并在锁外
+    睡眠到该令牌补充完成的时刻：每次调用只进入一次临界区，等待的线程按到达顺序
+    排队，不会在醒来后重复争抢锁。
+    """
+
+    def __init__(self, rate: int, period: float = 60.0, capacity: Optional[int] = None):
+        """
+        初始化限流器
+
+        Args:
+            rate: 每个周期允许的调用次数
+            period: 周期长度（秒），默认 60 秒
+            capacity: 桶容量（允许的突发调用数），默认等于 rate
+        """
+        if rate <= 0 or period <= 0:
+            raise ValueError(f"rate 和 period 必须为正数: rate={rate}, period={period}")
+
+        self.rate = rate
+        self.period = period
+        self.capacity = capacity if capacity is not None else rate
+        self._fill_rate = rate / period  # 每秒补充的令牌数
+        self._tokens = float(self.capacity)
+        self._last_refill = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self) -> None:
+        """按流逝时间补充令牌（调用方需持有锁）"""
+        now = time.monotonic()
+        elapsed = now - self._last_refill
+        if elapsed > 0:
+            self._tokens = min(self.capacity, self._tokens + elapsed * self._fill_rate)
+            self._last_refill = now
+
+    def try_acquire(self) -> bool:
+        """
+        尝试获取一个令牌（不阻塞）
+
+        Returns:
+            bool: 是否获取成功
+        """
+        with self._lock:
+            self._refill()
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return True
+            return False
+
+    def acquire(self) -> None:
+        """获取一个令牌，令牌不足时阻塞直到可用"""
+        with self._lock:
+            self._refill()
+            self._tokens -= 1
+            # 余额为负表示预支了尚未补充的令牌，需等待补足后再返回
+            wait_time = -self._tokens / self._fill_rate if self._tokens < 0 else 0.0
+        if wait_time > 0:
+            time.sleep(wait_time)
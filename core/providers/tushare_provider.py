@@ -1,29 +1,63 @@
 import os
 import time
 import threading
-from typing import Optional, Any
-from numpy import kaiser
-import tushare as ts
+from contextlib import contextmanager
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional, Any, Dict, List
 import pandas as pd
 from loguru import logger
-from dotenv import load_dotenv
 from .base_provider import BaseProvider
-
-load_dotenv()
+from .rate_limiter import TokenBucketRateLimiter
+from utils.env_helper import load_env
 
 # 在模块加载时就设置 NO_PROXY，确保绕过代理提高速度
 # 如果系统设置了代理，tushare API 请求可能会走代理导致速度慢
 os.environ["NO_PROXY"] = "api.waditu.com,.waditu.com,waditu.com"
 os.environ["no_proxy"] = os.environ["NO_PROXY"]
 
+class _PooledRequests:
+    """
+    tushare.pro.client 模块中 requests 的替代：post 经由连接池会话发出，其余属性透传给 requests
+    
+    SDK 传入的单一超时值作为读超时，另加独立的连接超时，即 timeout=(connect, read)
+    """
+
+    def __init__(self, session, connect_timeout: float):
+        import requests
+        self._requests = requests
+        self._session = session
+        self._connect_timeout = connect_timeout
+
+    def post(self, url, **kwargs):
+        timeout = kwargs.get("timeout")
+        if timeout is None or isinstance(timeout, (int, float)):
+            kwargs["timeout"] = (self._connect_timeout, timeout)
+        return self._session.post(url, **kwargs)
+
+    def __getattr__(self, name):
+        return getattr(self._requests, name)
+
+
 class TushareProvider(BaseProvider):
     """
     Tushare data provider implementation.
-    使用锁确保API调用完全串行，避免IP超限问题
+    使用令牌桶限流 + 并发上限控制API调用，允许多线程并发请求而不超过频率限制：
+    - TUSHARE_RATE_LIMIT: 每分钟最多调用次数（默认 200，对应 2000 积分档位）
+    - TUSHARE_MAX_CONCURRENCY: 同时进行的最大请求数（默认 4）
     """
     _instance = None
     _class_lock = threading.Lock()  # 类级别的锁，用于单例创建
     
+    # 查询结果缓存的有效期（秒），只缓存变化很慢的元数据接口；未列出的接口不缓存
+    QUERY_CACHE_TTL = {
+        "trade_cal": 86400,
+        "stock_basic": 3600,
+    }
+    QUERY_CACHE_MAX_ENTRIES = 128
+    # HTTP 连接超时（秒）；读超时沿用 tushare SDK 的 timeout（默认 30 秒）
+    HTTP_CONNECT_TIMEOUT = 5
+    
     def __new__(cls):
         if cls._instance is None:
             with cls._class_lock:
@@ -33,55 +67,167 @@ class TushareProvider(BaseProvider):
         return cls._instance
 
     def _init_api(self):
+        load_env()
         token = os.getenv("TUSHARE_TOKEN")
         if not token:
             logger.error("TUSHARE_TOKEN not found in environment variables.")
             raise ValueError("TUSHARE_TOKEN not found. Please set it in .env file.")
 
+        # tushare SDK 导入较重，延迟到首次创建 provider 时再导入，
+        # 不需要访问 Tushare 的入口（如只读数据库的策略脚本）不必承担这部分启动开销
+        import tushare as ts
+
         # NO_PROXY 已在模块加载时设置，这里确保配置生效
         # Initialize Tushare Pro API
         self.pro = ts.pro_api(token)
-        # 实例级别的锁，确保所有API调用串行
-        self._api_lock = threading.Lock()
-        logger.info("Tushare API initialized (NO_PROXY configured for waditu.com).")
+        # 调用频率由令牌桶控制，并发数由信号量控制（不再用全局锁强制串行）
+        rate_limit = int(os.getenv("TUSHARE_RATE_LIMIT", "200"))
+        max_concurrency = int(os.getenv("TUSHARE_MAX_CONCURRENCY", "4"))
+        self._rate_limiter = TokenBucketRateLimiter(rate=rate_limit, period=60.0)
+        self._api_semaphore = threading.BoundedSemaphore(max_concurrency)
+        self._max_concurrency = max_concurrency
+        self._install_http_session()
+        # 查询结果缓存: key -> (写入时间, DataFrame)，按 LRU 淘汰
+        self._query_cache: "OrderedDict[tuple, tuple]" = OrderedDict()
+        self._query_cache_lock = threading.Lock()
+        logger.info(f"Tushare API initialized (NO_PROXY configured for waditu.com, "
+                    f"rate_limit={rate_limit}/min, max_concurrency={max_concurrency}).")
+
+    def _install_http_session(self):
+        """
+        为 Tushare 客户端安装复用连接的 HTTP 会话
+        
+        tushare SDK 的 DataApi.query 每次调用都使用模块级的 requests.post，会为每个请求新建 TCP 连接。
+        这里保留 SDK 的 query（请求格式随 SDK 版本变化），只替换其传输层：将 tushare.pro.client
+        模块中的 requests 换成经由连接池会话发出 post 的代理（daily、pro_bar 等接口最终都经由
+        query 发出请求）。连接池大小与并发上限匹配且不重试，重试由 query 的重试循环负责；
+        连接超时单独设为 HTTP_CONNECT_TIMEOUT 秒，读超时沿用 SDK 的设置。
+        SDK 结构不兼容时保留原实现。
+        """
+        import requests
+        from requests.adapters import HTTPAdapter
+        from tushare.pro import client as ts_client
+
+        if getattr(getattr(ts_client, "requests", None), "post", None) is None:
+            logger.warning("当前 tushare 版本不支持安装连接池会话，使用 SDK 默认请求方式")
+            return
+
+        session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self._max_concurrency * 2, max_retries=0)
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+
+        self._http_session = session
+        ts_client.requests = _PooledRequests(session, self.HTTP_CONNECT_TIMEOUT)
+
+    @contextmanager
+    def _api_slot(self):
+        """占用一个并发名额并消耗一个限流令牌，用于包裹单次API调用"""
+        with self._api_semaphore:
+            self._rate_limiter.acquire()
+            yield
 
     def query(self, api_name: str, fields: Optional[str] = None, **kwargs: Any) -> pd.DataFrame:
         """
         Execute a query against Tushare API with retry mechanism.
-        使用锁确保API调用完全串行，避免IP超限问题
+        每次尝试都经过限流器，可被多个线程并发调用；
+        QUERY_CACHE_TTL 中列出的元数据接口（trade_cal、stock_basic）在有效期内直接返回缓存结果
         
         重试策略：
         - 最多重试 3 次
-        - 每次重试间隔 2 秒
+        - 重试间隔指数退避：2 秒、4 秒（应对限流等临时错误，等待期间不占用并发名额）
         - 记录每次尝试的日志
         """
+        ttl = self.QUERY_CACHE_TTL.get(api_name, 0)
+        cache_key = None
+        if ttl > 0:
+            cache_key = (api_name, fields, tuple(sorted(kwargs.items())))
+            try:
+                hash(cache_key)
+            except TypeError:
+                cache_key = None  # 参数不可哈希（如列表）时不使用缓存
+        if cache_key is not None:
+            cached = self._get_cached_query(cache_key, ttl)
+            if cached is not None:
+                logger.debug(f"Tushare API {api_name} cache hit, Rows: {len(cached)}")
+                return cached
+        
         max_retries = 3
         retry_delay = 2  # 秒
-        with self._api_lock:
-            for attempt in range(max_retries):
-                start_time = time.time()
-                try:
+        for attempt in range(max_retries):
+            start_time = time.time()
+            try:
+                with self._api_slot():
                     df = self.pro.query(api_name, fields=fields, **kwargs)
-                    elapsed = time.time() - start_time
-                    logger.debug(f"Tushare API {api_name} success. Time: {elapsed:.3f}s, Rows: {len(df) if df is not None else 0}")
-                    return df
-                except Exception as e:
-                    elapsed = time.time() - start_time
-                    
-                    if attempt < max_retries - 1:
-                        logger.warning(f"Tushare API {api_name} failed (attempt {attempt + 1}/{max_retries}). "
-                                     f"Time: {elapsed:.3f}s. Error: {e}. Retrying in {retry_delay}s...")
-                        time.sleep(retry_delay)
-                    else:
-                        logger.error(f"Tushare API {api_name} failed after {max_retries} attempts. "
-                                   f"Time: {elapsed:.3f}s. Error: {e}")
-                        raise
+                elapsed = time.time() - start_time
+                logger.debug(f"Tushare API {api_name} success. Time: {elapsed:.3f}s, Rows: {len(df) if df is not None else 0}")
+                if cache_key is not None and df is not None and not df.empty:
+                    self._set_cached_query(cache_key, df)
+                return df
+            except Exception as e:
+                elapsed = time.time() - start_time
+                
+                if attempt < max_retries - 1:
+                    delay = retry_delay * (2 ** attempt)
+                    logger.warning(f"Tushare API {api_name} failed (attempt {attempt + 1}/{max_retries}). "
+                                 f"Time: {elapsed:.3f}s. Error: {e}. Retrying in {delay}s...")
+                    time.sleep(delay)
+                else:
+                    logger.error(f"Tushare API {api_name} failed after {max_retries} attempts. "
+                               f"Time: {elapsed:.3f}s. Error: {e}")
+                    raise
+
+    def _get_cached_query(self, key: tuple, ttl: float) -> Optional[pd.DataFrame]:
+        """读取未过期的缓存结果，返回副本避免调用方修改污染缓存"""
+        with self._query_cache_lock:
+            entry = self._query_cache.get(key)
+            if entry is None:
+                return None
+            cached_at, df = entry
+            if time.monotonic() - cached_at >= ttl:
+                del self._query_cache[key]
+                return None
+            self._query_cache.move_to_end(key)
+        return df.copy()
+
+    def _set_cached_query(self, key: tuple, df: pd.DataFrame) -> None:
+        """写入缓存，超过容量时淘汰最久未使用的结果"""
+        with self._query_cache_lock:
+            self._query_cache[key] = (time.monotonic(), df.copy())
+            self._query_cache.move_to_end(key)
+            while len(self._query_cache) > self.QUERY_CACHE_MAX_ENTRIES:
+                self._query_cache.popitem(last=False)
+
+    def query_many(self, jobs: List[Dict[str, Any]], max_workers: Optional[int] = None) -> List[pd.DataFrame]:
+        """
+        并发执行多个 query 调用（如逐只股票查询），结果按输入顺序返回
+        
+        线程池只负责排队和并发发起请求，实际并发数和调用频率仍由 query 内的
+        并发信号量和令牌桶统一控制
+        
+        :param jobs: 查询参数列表，每项包含 api_name、可选的 fields 以及其他查询参数，
+                     如 {"api_name": "dividend", "fields": "ts_code,ex_date", "ts_code": "000001.SZ"}
+        :param max_workers: 线程数，默认等于最大并发请求数
+        :return: 与 jobs 一一对应的 DataFrame 列表；任一调用重试后仍失败时抛出该异常
+        """
+        if not jobs:
+            return []
+        
+        def run_job(job: Dict[str, Any]) -> pd.DataFrame:
+            params = dict(job)
+            api_name = params.pop("api_name")
+            fields = params.pop("fields", None)
+            return self.query(api_name, fields=fields, **params)
+        
+        workers = min(max_workers or self._max_concurrency, len(jobs))
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="tushare_query") as executor:
+            return list(executor.map(run_job, jobs))
 
     def daily(self, ts_code: str, start_date: str, end_date: str) -> pd.DataFrame:
         """
         使用 pro.daily API 获取股票日线数据
         """
-        with self._api_lock:
+        with self._api_slot():
             try:
                 df = self.pro.daily(ts_code=ts_code, start_date=start_date, end_date=end_date)
                 return df
@@ -103,7 +249,7 @@ class TushareProvider(BaseProvider):
         """
         使用 pro_bar API 获取股票K线数据（更快，一次获取全部历史）
         优势：一次调用可以获取单只股票的全部历史数据，比多次调用 pro.daily 更快
-        使用锁确保API调用完全串行，避免IP超限问题
+        经过限流器控制调用频率，避免IP超限问题
         
         :param ts_code: 股票代码
         :param start_date: 开始日期 YYYYMMDD
@@ -113,9 +259,10 @@ class TushareProvider(BaseProvider):
         :param factors: 复权因子，tor=前复权因子，None=不复权因子
         :return: DataFrame，包含日线数据和复权因子（如果factors参数指定）
         """
-        with self._api_lock:
+        with self._api_slot():
             start_time = time.time()
             try:
+                import tushare as ts
                 df = ts.pro_bar(
                     ts_code=ts_code,
                     adj=adj,
@@ -43,24 +43,19 @@ class AdjFactorTransformer(BaseTransformer):
         
         
         try:
-            # 复制数据，避免修改原始数据
-            df = data.copy()
+            # 浅拷贝：后续只做整列赋值（替换列而非原地写入），不会修改原始数据，
+            # 也避免了整表深拷贝
+            df = data.copy(deep=False)
             
             # 1. 字段重命名（如果需要）
             column_mapping = self.transform_rules.get("column_mapping", {})
             if column_mapping:
                 df = self._rename_columns(df, column_mapping)
             
-            # 2. 标准化日期格式
-            if 'trade_date' in df.columns:
-                df['trade_date'] = df['trade_date'].apply(
-                    lambda x: DateHelper.normalize_to_yyyy_mm_dd(str(x)) if pd.notna(x) else None
-                )
-            
-            if 'update_time' in df.columns:
-                df['update_time'] = df['update_time'].apply(
-                    lambda x: DateHelper.normalize_to_yyyy_mm_dd(str(x)) if pd.notna(x) else None
-                )
+            # 2. 标准化日期格式（向量化解析，代替逐行调用 normalize_to_yyyy_mm_dd）
+            for date_col in ('trade_date', 'update_time'):
+                if date_col in df.columns:
+                    df[date_col] = DateHelper.normalize_series_to_yyyy_mm_dd(df[date_col])
             
             # 3. 数据类型转换
             if 'adj_factor' in df.columns:
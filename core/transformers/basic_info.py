@@ -43,8 +43,9 @@ class BasicInfoTransformer(BaseTransformer):
         
         
         try:
-            # 复制数据，避免修改原始数据
-            df = data.copy()
+            # 浅拷贝：后续只做整列赋值（替换列而非原地写入），不会修改原始数据，
+            # 也避免了整表深拷贝
+            df = data.copy(deep=False)
             
             # 1. 字段重命名（如果需要）
             column_mapping = self.transform_rules.get("column_mapping", {})
@@ -52,10 +53,11 @@ class BasicInfoTransformer(BaseTransformer):
                 df = self._rename_columns(df, column_mapping)
             
             # 2. 标准化日期格式
+            # 空字符串（未上市等情况）先视为缺失，其余整列向量化解析
             if 'list_date' in df.columns:
-                df['list_date'] = df['list_date'].apply(
-                    lambda x: DateHelper.normalize_to_yyyy_mm_dd(str(x)) if pd.notna(x) else None
-                )
+                list_date = df['list_date']
+                list_date = list_date.mask(list_date.astype(str).str.strip() == '')
+                df['list_date'] = DateHelper.normalize_series_to_yyyy_mm_dd(list_date)
             
             # 3. 确保 symbol 字段存在（如果没有，从 ts_code 提取）
             if 'symbol' not in df.columns and 'ts_code' in df.columns:
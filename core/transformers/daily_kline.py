@@ -14,6 +14,11 @@ from core.common.exceptions import TransformerException
 from utils.date_helper import DateHelper
 
 
+# 价格类字段在库中为 DECIMAL(10, 2)，float32（约7位有效数字）足以无损表示到分，
+# 内存占用减半；vol / amount 数值范围大，保留 float64
+PRICE_COLUMNS_F32 = ['open', 'high', 'low', 'close', 'pre_close', 'change']
+
+
 class DailyKlineTransformer(BaseTransformer):
     """
     日K线数据转换器
@@ -46,8 +51,9 @@ class DailyKlineTransformer(BaseTransformer):
         # logger.debug(f"开始转换日K线数据，数据量: {len(data)}")
         
         try:
-            # 复制数据，避免修改原始数据
-            df = data.copy()
+            # 浅拷贝：后续只做整列赋值（替换列而非原地写入），不会修改原始数据，
+            # 也避免了整表深拷贝
+            df = data.copy(deep=False)
             
             # 1. 字段重命名（如果需要）
             # Tushare API 返回的字段名通常已经是标准格式，但为了兼容性，可以添加映射
@@ -57,32 +63,36 @@ class DailyKlineTransformer(BaseTransformer):
             
             # 2. 标准化日期格式
             if 'trade_date' in df.columns:
-                df['trade_date'] = df['trade_date'].apply(
-                    lambda x: DateHelper.normalize_to_yyyy_mm_dd(str(x)) if pd.notna(x) else None
-                )
+                df['trade_date'] = DateHelper.normalize_series_to_yyyy_mm_dd(df['trade_date'])
             
             # 3. 数据类型转换
+            # Tushare 返回的数值列通常已是 float64，只对非数值类型的列做一次整体转换
             numeric_columns = ['open', 'high', 'low', 'close', 'vol', 'amount', 'change', 'pct_chg']
-            for col in numeric_columns:
-                if col in df.columns:
-                    df[col] = pd.to_numeric(df[col], errors='coerce')
+            to_convert = [
+                col for col in numeric_columns
+                if col in df.columns and not pd.api.types.is_numeric_dtype(df[col])
+            ]
+            if to_convert:
+                df[to_convert] = df[to_convert].apply(pd.to_numeric, errors='coerce')
+            
+            # 4 & 5. 剔除停牌数据 / OHLC 关系异常数据：累积到同一个保留掩码，最后只做一次布尔索引
+            keep = pd.Series(True, index=df.index)
             
             # 4. 剔除停牌数据（如果配置了 remove_halted）
             if self.transform_rules.get("remove_halted", False):
-                initial_count = len(df)
                 # 停牌数据通常表现为：vol=0 或 amount=0 或 close=0
-                df = df[
+                halted_mask = ~(
                     (df['vol'].fillna(0) > 0) & 
                     (df['amount'].fillna(0) > 0) & 
                     (df['close'].fillna(0) > 0)
-                ]
-                removed_count = initial_count - len(df)
+                )
+                removed_count = int(halted_mask.sum())
                 if removed_count > 0:
                     logger.info(f"剔除停牌数据: {removed_count} 条")
+                keep &= ~halted_mask
             
             # 5. 验证 OHLC 关系（如果配置了 validate_ohlc）
             if self.transform_rules.get("validate_ohlc", False):
-                initial_count = len(df)
                 # 验证：high >= low, high >= open, high >= close, low <= open, low <= close
                 invalid_mask = (
                     (df['high'] < df['low']) |
@@ -90,14 +100,15 @@ class DailyKlineTransformer(BaseTransformer):
                     (df['high'] < df['close']) |
                     (df['low'] > df['open']) |
                     (df['low'] > df['close'])
-                )
-                invalid_count = invalid_mask.sum()
+                ) & keep
+                invalid_count = int(invalid_mask.sum())
                 if invalid_count > 0:
                     logger.warning(f"发现 {invalid_count} 条 OHLC 关系异常的数据，将被剔除")
-                    df = df[~invalid_mask]
-                    removed_count = initial_count - len(df)
-                    if removed_count > 0:
-                        logger.info(f"剔除 OHLC 异常数据: {removed_count} 条")
+                    logger.info(f"剔除 OHLC 异常数据: {invalid_count} 条")
+                keep &= ~invalid_mask
+            
+            if not keep.all():
+                df = df[keep]
             
             # 6. 处理缺失值（如果配置了 fill_missing）
             if self.transform_rules.get("fill_missing", False):
@@ -117,7 +128,12 @@ class DailyKlineTransformer(BaseTransformer):
             if 'ts_code' in df.columns and 'trade_date' in df.columns:
                 df = df.sort_values(['ts_code', 'trade_date']).reset_index(drop=True)
             
-            # 9. 将 nan 值转换为 None，确保数据库兼容性
+            # 9. 价格列降为 float32，减少内存占用和写入时需要搬运的数据量
+            price_columns = [col for col in PRICE_COLUMNS_F32 if col in df.columns]
+            if price_columns:
+                df[price_columns] = df[price_columns].astype('float32')
+            
+            # 10. 将 nan 值转换为 None，确保数据库兼容性
             # 将所有 pandas/numpy 的 nan 值统一转换为 None，避免 MySQL 报错
             df = df.where(pd.notna(df), None)
             
@@ -78,9 +78,7 @@ class IntradayKlineTransformer(BaseTransformer):
             
             # 2. 标准化日期格式
             if 'trade_date' in df.columns:
-                df['trade_date'] = df['trade_date'].apply(
-                    lambda x: DateHelper.normalize_to_yyyy_mm_dd(str(x)) if pd.notna(x) else None
-                )
+                df['trade_date'] = DateHelper.normalize_series_to_yyyy_mm_dd(df['trade_date'])
             
             # 3. 标准化时间格式
             if 'time' in df.columns:
@@ -105,17 +103,23 @@ class IntradayKlineTransformer(BaseTransformer):
             # 6. 剔除异常数据
             initial_count = len(df)
             
+            # 各条件合并为一个布尔掩码，只切片一次，避免每个条件都复制一遍 DataFrame
+            keep = pd.Series(True, index=df.index)
+            
             # 剔除价格为0或负数的数据
             if 'price' in df.columns:
-                df = df[df['price'] > 0]
+                keep &= df['price'] > 0
             
-            # 剔除成交量为负数的数据
+            # 剔除成交量为负数的数据（Int64 缺失值比较结果为 NA，按不保留处理）
             if 'volume' in df.columns:
-                df = df[df['volume'] >= 0]
+                keep &= (df['volume'] >= 0).fillna(False).astype(bool)
             
             # 剔除成交额为负数的数据
             if 'amount' in df.columns:
-                df = df[df['amount'] >= 0]
+                keep &= df['amount'] >= 0
+            
+            if not keep.all():
+                df = df[keep]
             
             removed_count = initial_count - len(df)
             if removed_count > 0:
@@ -10,6 +10,7 @@ from loguru import logger
 
 from core.transformers.base import BaseTransformer
 from core.common.exceptions import TransformerException
+from core.common.validators import DataValidator
 from utils.date_helper import DateHelper
 
 
@@ -56,6 +57,7 @@ class TradeCalendarTransformer(BaseTransformer):
                 - czce_open: CZCE是否交易 (bool)
                 - dce_open: DCE是否交易 (bool)
                 - ine_open: INE是否交易 (bool)
+                本次数据中未出现的交易所对应列为 None
             
         Raises:
             TransformerException: 转换失败时抛出异常
@@ -67,28 +69,28 @@ class TradeCalendarTransformer(BaseTransformer):
         
         
         try:
-            # 复制数据，避免修改原始数据
-            df = data.copy()
-            
             # 1. 字段重命名（如果需要）
             column_mapping = self.transform_rules.get("column_mapping", {})
             if column_mapping:
-                df = self._rename_columns(df, column_mapping)
+                data = self._rename_columns(data, column_mapping)
             
             # 2. 确保必需字段存在
-            required_columns = ['exchange', 'cal_date', 'is_open']
-            missing_columns = [col for col in required_columns if col not in df.columns]
-            if missing_columns:
-                raise TransformerException(f"缺少必需的列: {missing_columns}")
+            DataValidator.validate_required_columns(data, ['exchange', 'cal_date', 'is_open'])
             
-            # 3. 标准化日期格式
-            df['cal_date'] = df['cal_date'].apply(
-                lambda x: DateHelper.normalize_to_yyyy_mm_dd(str(x)) if pd.notna(x) else None
-            )
+            # 3. 按列整体校验 is_open 取值范围（只用于报告，不丢弃数据：丢弃会使该交易所当天被写成休市）
+            is_open = pd.to_numeric(data['is_open'], errors='coerce').fillna(0)
+            in_range = DataValidator.build_range_mask(is_open.to_frame(), {'is_open': (0, 1)})
+            if not in_range.all():
+                logger.warning(f"is_open 不在 0/1 范围内的数据: {int((~in_range).sum())} 条，已截断到 0/1")
             
-            # 4. 数据类型转换：将 is_open 转换为布尔值
-            df['is_open'] = pd.to_numeric(df['is_open'], errors='coerce').fillna(0).astype(int)
-            df['is_open'] = df['is_open'].clip(0, 1).astype(bool)  # 转换为布尔值
+            # 4. 只用需要的三列构建新 DataFrame（不复制整个原始数据，也不修改原始数据）：
+            # 标准化日期格式，并将 is_open 转换为布尔值
+            # （先截断到 0/1 再转为 int8，0/1 标志无需 int64 的 8 字节中间列）
+            df = pd.DataFrame({
+                'exchange': data['exchange'],
+                'cal_date': DateHelper.normalize_series_to_yyyy_mm_dd(data['cal_date']),
+                'is_open': is_open.clip(0, 1).astype('int8').astype(bool),
+            })
             
             # 5. 数据去重（基于 exchange 和 cal_date）
             initial_count = len(df)
@@ -98,37 +100,21 @@ class TradeCalendarTransformer(BaseTransformer):
                 logger.info(f"去除重复数据: {removed_count} 条")
             
             # 6. 将长格式转换为宽格式（按日期聚合，每个交易所作为一列）
-            # 使用 pivot_table 将 exchange 列转换为多个列
-            pivot_df = df.pivot_table(
-                index='cal_date',
-                columns='exchange',
-                values='is_open',
-                aggfunc='first'  # 如果同一日期同一交易所有多条记录，取第一条
+            # 已按 (exchange, cal_date) 去重，直接 unstack 即可，避免 pivot_table 的分组聚合；
+            # 已采集交易所缺失的日期在 unstack 时一次性填充为 False，全程保持 bool 类型
+            df = df[df['cal_date'].notna()]
+            wide = (
+                df.set_index(['cal_date', 'exchange'])['is_open']
+                .unstack(fill_value=False)
+                .sort_index()
             )
             
-            # 7. 重命名列为模型需要的格式（{exchange}_open）
-            # 只处理已知的交易所
-            result_df = pd.DataFrame(index=pivot_df.index)
-            result_df['cal_date'] = result_df.index
-            
-            # 为每个已知交易所创建列
-            for exchange_code, column_name in self.EXCHANGE_MAPPING.items():
-                if exchange_code in pivot_df.columns:
-                    # 先转换为布尔值，缺失值填充为 False
-                    series = pivot_df[exchange_code]
-                    result_df[column_name] = series.where(pd.notna(series), False).astype(bool)
-                else:
-                    # 如果该交易所没有数据，默认为 False
-                    result_df[column_name] = False
-            
-            # 8. 重置索引，使 cal_date 成为普通列
-            result_df = result_df.reset_index(drop=True)
-            
-            # 9. 按日期排序
-            result_df = result_df.sort_values('cal_date').reset_index(drop=True)
-            
-            # 10. 确保 cal_date 是字符串格式
-            result_df['cal_date'] = result_df['cal_date'].astype(str)
+            # 7. 构建结果 DataFrame，列名为模型需要的格式（{exchange}_open）；
+            # 本次未采集的交易所保持为 None（NULL），upsert 时保留数据库中的现有值，
+            # 而不是被写成休市（False）
+            result_df = pd.DataFrame({'cal_date': wide.index.astype(str)})
+            for exchange, column in self.EXCHANGE_MAPPING.items():
+                result_df[column] = wide[exchange].to_numpy(dtype=bool) if exchange in wide.columns else None
             
             logger.debug(f"转换完成，最终数据量: {len(result_df)} 条（从 {len(df)} 条长格式数据转换）")
             return result_df
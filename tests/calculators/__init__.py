@@ -0,0 +1,3 @@
+"""
+Calculator 层测试模块
+"""
@@ -0,0 +1,70 @@
+"""
+技术指标计算器测试
+"""
+import sys
+from pathlib import Path
+import numpy as np
+import pandas as pd
+import pytest
+
+# 添加项目根目录到路径
+project_path = Path(__file__).parent.parent
+sys.path.insert(0, str(project_path))
+
+from core.calculators.indicator_calculator import IndicatorCalculator
+
+
+@pytest.fixture
+def kline_df():
+    """构造带缺失值和横盘区间的K线数据"""
+    rng = np.random.default_rng(0)
+    n = 60
+    close = np.cumsum(rng.normal(0, 1, n)) + 100
+    df = pd.DataFrame({
+        'open': close,
+        'high': close + rng.random(n),
+        'low': close - rng.random(n),
+        'close': close,
+    })
+    df.loc[5, 'close'] = np.nan
+    df.loc[20:30, ['high', 'low']] = 50.0
+    return df
+
+
+class TestIndicatorCalculator:
+    """技术指标计算器测试类"""
+    
+    def test_kdj_matches_recurrence(self, kline_df):
+        """测试向量化KDJ与逐日递推公式结果一致"""
+        result = IndicatorCalculator().calculate_kdj(kline_df, period=9)
+        
+        low_min = kline_df['low'].rolling(window=9).min()
+        high_max = kline_df['high'].rolling(window=9).max()
+        rsv = np.where(
+            (high_max - low_min) != 0,
+            (kline_df['close'] - low_min) / (high_max - low_min) * 100,
+            50.0
+        )
+        rsv = np.nan_to_num(rsv, nan=50.0)
+        
+        k = [50.0]
+        d = [50.0]
+        for i in range(1, len(kline_df)):
+            k.append((2/3) * k[-1] + (1/3) * rsv[i])
+            d.append((2/3) * d[-1] + (1/3) * k[i])
+        
+        np.testing.assert_allclose(result['kdj_k'], k, rtol=1e-12)
+        np.testing.assert_allclose(result['kdj_d'], d, rtol=1e-12)
+        np.testing.assert_allclose(result['kdj_j'], 3 * np.array(k) - 2 * np.array(d), rtol=1e-9)
+    
+    def test_atr_true_range(self, kline_df):
+        """测试ATR的真实波幅计算（首行无前收盘价时只取最高价减最低价）"""
+        result = IndicatorCalculator().calculate_atr(kline_df, period=1)
+        
+        row = kline_df.iloc[1]
+        pre_close = kline_df['close'].iloc[0]
+        expected = max(row['high'] - row['low'], abs(row['high'] - pre_close), abs(row['low'] - pre_close))
+        
+        assert result['atr'].iloc[0] == pytest.approx(kline_df['high'].iloc[0] - kline_df['low'].iloc[0])
+        assert result['atr'].iloc[1] == pytest.approx(expected)
+        assert 'tr' not in result.columns
@@ -0,0 +1,3 @@
+"""
+Common 层测试模块
+"""
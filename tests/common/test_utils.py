@@ -0,0 +1,58 @@
+"""
+公共工具函数测试
+"""
+import sys
+from pathlib import Path
+import numpy as np
+import pandas as pd
+import pytest
+
+# 添加项目根目录到路径
+project_path = Path(__file__).parent.parent
+sys.path.insert(0, str(project_path))
+
+from core.common.utils import merge_dataframes
+
+
+class TestMergeDataframes:
+    """merge_dataframes 测试类"""
+    
+    def test_merge_same_schema(self):
+        """测试列和类型一致时按列拼接，保留类型并重置索引"""
+        df1 = pd.DataFrame({
+            'ts_code': ['000001.SZ', '000001.SZ'],
+            'close': np.array([10.5, 10.8], dtype=np.float32),
+            'vol': [100, 200],
+        }, index=[5, 6])
+        df2 = pd.DataFrame({
+            'ts_code': ['600000.SH'],
+            'close': np.array([8.1], dtype=np.float32),
+            'vol': [300],
+        })
+        
+        result = merge_dataframes([df1, df2])
+        
+        assert result['ts_code'].tolist() == ['000001.SZ', '000001.SZ', '600000.SH']
+        assert result['close'].dtype == np.float32
+        assert result['vol'].tolist() == [100, 200, 300]
+        assert result.index.tolist() == [0, 1, 2]
+        pd.testing.assert_frame_equal(result, pd.concat([df1, df2], ignore_index=True))
+    
+    def test_merge_mismatched_schema_falls_back(self):
+        """测试列不一致时退回 pd.concat"""
+        df1 = pd.DataFrame({'ts_code': ['000001.SZ'], 'close': [10.5]})
+        df2 = pd.DataFrame({'ts_code': ['600000.SH'], 'open': [8.0]})
+        
+        result = merge_dataframes([df1, df2])
+        
+        assert len(result) == 2
+        assert set(result.columns) == {'ts_code', 'close', 'open'}
+    
+    def test_merge_empty(self):
+        """测试空列表和 None 输入"""
+        assert merge_dataframes([]).empty
+        assert merge_dataframes([None]).empty
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
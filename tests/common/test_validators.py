@@ -0,0 +1,49 @@
+"""
+数据验证器测试
+"""
+import sys
+from pathlib import Path
+import numpy as np
+import pandas as pd
+import pytest
+
+# 添加项目根目录到路径
+project_path = Path(__file__).parent.parent
+sys.path.insert(0, str(project_path))
+
+from core.common.exceptions import ValidationException
+from core.common.validators import DataValidator
+
+
+@pytest.fixture
+def calendar_df():
+    """构造交易日历样例数据"""
+    return pd.DataFrame({
+        'cal_date': ['20240102', '20240103', '20240104', '20240105'],
+        'is_open': [1, 0, 2, np.nan],
+    })
+
+
+class TestDataValidator:
+    """DataValidator 测试类"""
+    
+    def test_required_columns(self, calendar_df):
+        """测试缺少必需列时抛出异常"""
+        assert DataValidator.validate_required_columns(calendar_df, ['cal_date', 'is_open'])
+        with pytest.raises(ValidationException):
+            DataValidator.validate_required_columns(calendar_df, ['cal_date', 'exchange'])
+    
+    def test_data_types(self, calendar_df):
+        """测试按列推断类型（缺失值不影响判断）"""
+        assert DataValidator.validate_data_types(calendar_df, {'cal_date': str, 'is_open': float})
+        assert not DataValidator.validate_data_types(calendar_df, {'cal_date': int})
+        assert not DataValidator.validate_data_types(calendar_df, {'exchange': str})
+    
+    def test_range_split(self, calendar_df):
+        """测试范围校验与拆分（缺失值视为合法）"""
+        ranges = {'is_open': (0, 1)}
+        assert not DataValidator.validate_data_range(calendar_df, ranges)
+        
+        valid, invalid = DataValidator.split_by_range(calendar_df, ranges)
+        assert valid['cal_date'].tolist() == ['20240102', '20240103', '20240105']
+        assert invalid['cal_date'].tolist() == ['20240104']
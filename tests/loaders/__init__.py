@@ -0,0 +1,3 @@
+"""
+Loader 层测试模块
+"""
@@ -0,0 +1,84 @@
+"""
+TradeCalendarLoader 测试文件
+
+使用 pytest 测试交易日历按交易所分别写入与存在性检查（需要可连接的 MySQL）
+"""
+
+import sys
+from pathlib import Path
+import pytest
+import pandas as pd
+
+# 添加项目根目录到路径
+project_path = Path(__file__).parent.parent
+sys.path.insert(0, str(project_path))
+
+from sqlalchemy import text
+
+from core.loaders.base import BaseLoader
+from core.loaders.trade_calendar import TradeCalendarLoader
+from core.transformers.trade_calendar import TradeCalendarTransformer
+
+
+# 使用远离真实数据的日期，测试前后清理
+TEST_DATE = '1990-01-02'
+
+
+@pytest.fixture(scope="module")
+def loader():
+    """创建 TradeCalendarLoader 实例，数据库不可用时跳过"""
+    loader = TradeCalendarLoader()
+    try:
+        with loader._get_session() as session:
+            session.execute(text("SELECT 1"))
+    except Exception as e:
+        pytest.skip(f"MySQL 不可用: {e}")
+    return loader
+
+
+@pytest.fixture
+def transformer():
+    """创建 TradeCalendarTransformer 实例"""
+    return TradeCalendarTransformer()
+
+
+@pytest.fixture(autouse=True)
+def cleanup(loader):
+    """测试前后删除测试日期的日历数据"""
+    def delete():
+        with loader._get_session() as session:
+            session.execute(text("DELETE FROM trade_calendar WHERE cal_date = :d"), {"d": TEST_DATE})
+    delete()
+    yield
+    delete()
+
+
+def load_exchanges(loader, transformer, exchanges):
+    """按指定交易所构造长格式数据，转换后 upsert 写入"""
+    raw_data = pd.DataFrame([
+        {'exchange': ex, 'cal_date': TEST_DATE.replace('-', ''), 'is_open': 1}
+        for ex in exchanges
+    ])
+    loader.load(transformer.transform(raw_data), strategy=BaseLoader.LOAD_STRATEGY_UPSERT)
+
+
+def test_sse_only_then_all(loader, transformer):
+    """先只写入 SSE，SZSE 应视为缺失；再写入 ALL 后两个交易所都存在"""
+    load_exchanges(loader, transformer, ['SSE'])
+    assert loader.has_date(TEST_DATE)
+    assert loader.has_date(TEST_DATE, exchange='SSE')
+    assert not loader.has_date(TEST_DATE, exchange='SZSE')
+
+    load_exchanges(loader, transformer, ['SSE', 'SZSE'])
+    assert loader.has_date(TEST_DATE, exchange='SSE')
+    assert loader.has_date(TEST_DATE, exchange='SZSE')
+
+
+def test_single_exchange_keeps_others(loader, transformer):
+    """只写入 SZSE 时不覆盖已存在的 SSE 值"""
+    load_exchanges(loader, transformer, ['SSE'])
+    load_exchanges(loader, transformer, ['SZSE'])
+
+    row = loader.read(cal_date=TEST_DATE).iloc[0]
+    assert row['sse_open'] == 1
+    assert row['szse_open'] == 1
@@ -0,0 +1,3 @@
+"""
+Provider 层测试模块
+"""
@@ -0,0 +1,77 @@
+"""
+令牌桶限流器测试
+"""
+import sys
+import time
+import threading
+from pathlib import Path
+import pytest
+
+# 添加项目根目录到路径
+project_path = Path(__file__).parent.parent
+sys.path.insert(0, str(project_path))
+
+from core.providers.rate_limiter import TokenBucketRateLimiter
+
+
+class TestTokenBucketRateLimiter:
+    """令牌桶限流器测试类"""
+    
+    def test_burst_up_to_capacity(self):
+        """测试桶满时允许突发调用，超过容量后拒绝"""
+        limiter = TokenBucketRateLimiter(rate=3, period=60.0)
+        
+        assert all(limiter.try_acquire() for _ in range(3))
+        assert not limiter.try_acquire()
+    
+    def test_acquire_waits_for_refill(self):
+        """测试令牌耗尽后 acquire 阻塞到补充令牌"""
+        limiter = TokenBucketRateLimiter(rate=10, period=1.0, capacity=1)
+        limiter.acquire()
+        
+        start = time.monotonic()
+        limiter.acquire()
+        elapsed = time.monotonic() - start
+        
+        # 每 0.1 秒补充一个令牌
+        assert 0.05 <= elapsed < 0.5
+    
+    def test_concurrent_acquire_respects_rate(self):
+        """测试多线程并发获取时总速率不超过限制"""
+        limiter = TokenBucketRateLimiter(rate=20, period=1.0, capacity=5)
+        acquired = []
+        
+        def worker():
+            for _ in range(3):
+                limiter.acquire()
+                acquired.append(time.monotonic())
+        
+        start = time.monotonic()
+        threads = [threading.Thread(target=worker) for _ in range(5)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        elapsed = time.monotonic() - start
+        
+        # 15 次调用：5 次来自初始容量，其余 10 次按 20/s 补充，至少约 0.5 秒
+        assert len(acquired) == 15
+        assert elapsed >= 0.4
+    
+    def test_pending_reservations_block_try_acquire(self):
+        """测试已预支的令牌未补足前，try_acquire 不会插队"""
+        limiter = TokenBucketRateLimiter(rate=10, period=1.0, capacity=1)
+        limiter.acquire()
+        
+        waiter = threading.Thread(target=limiter.acquire)
+        waiter.start()
+        time.sleep(0.02)
+        
+        # 等待中的线程已预支下一个令牌
+        assert not limiter.try_acquire()
+        waiter.join()
+    
+    def test_invalid_rate(self):
+        """测试无效参数"""
+        with pytest.raises(ValueError):
+            TokenBucketRateLimiter(rate=0)
@@ -101,7 +101,7 @@ class TestTradeCalendarTransformer:
         
         assert len(result) == 1
         assert result['sse_open'].iloc[0] == True
-        assert result['szse_open'].iloc[0] == False  # 没有数据，默认为 False
+        assert result['szse_open'].iloc[0] is None  # 未采集该交易所，保持为 NULL
     
     def test_transform_deduplicate(self, transformer):
         """测试数据去重"""
@@ -115,6 +115,21 @@ class TestTradeCalendarTransformer:
         # 应该只保留一条（keep='last'）
         assert len(result) == 1
         assert result['sse_open'].iloc[0] == False
+
+    def test_transform_clip_invalid_is_open(self, transformer):
+        """测试 is_open 不在 0/1 范围内的数据截断到 0/1 而不是丢弃"""
+        data = pd.DataFrame([
+            {'exchange': 'SSE', 'cal_date': '20240101', 'is_open': 1},
+            {'exchange': 'SZSE', 'cal_date': '20240101', 'is_open': 5},  # 非法，截断为 1
+            {'exchange': 'SSE', 'cal_date': '20240102', 'is_open': -1},  # 非法，截断为 0
+        ])
+
+        result = transformer.transform(data)
+
+        assert len(result) == 2
+        assert result['sse_open'].iloc[0] == True
+        assert result['szse_open'].iloc[0] == True
+        assert result['sse_open'].iloc[1] == False
     
     def test_transform_empty_data(self, transformer):
         """测试空数据"""
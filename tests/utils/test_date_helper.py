@@ -3,6 +3,8 @@ import os
 import pytest
 from datetime import date, datetime, timedelta
 
+import pandas as pd
+
 # Add project root to sys.path
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
@@ -27,6 +29,13 @@ class TestNormalizeToYyyyMmDd:
         assert DateHelper.normalize_to_yyyy_mm_dd("  20231225  ") == "2023-12-25"
         assert DateHelper.normalize_to_yyyy_mm_dd("  2023-12-25  ") == "2023-12-25"
     
+    def test_normalize_cached(self):
+        """测试重复日期命中缓存"""
+        DateHelper.normalize_to_yyyy_mm_dd("20230615")
+        hits = DateHelper.normalize_to_yyyy_mm_dd.cache_info().hits
+        assert DateHelper.normalize_to_yyyy_mm_dd("20230615") == "2023-06-15"
+        assert DateHelper.normalize_to_yyyy_mm_dd.cache_info().hits == hits + 1
+    
     def test_normalize_invalid_date(self):
         """测试无效日期"""
         with pytest.raises(ValueError):
@@ -52,6 +61,30 @@ class TestNormalizeToYyyyMmDd:
             DateHelper.normalize_to_yyyy_mm_dd(None)
 
 
+class TestNormalizeSeriesToYyyyMmDd:
+    """测试 normalize_series_to_yyyy_mm_dd 方法（向量化，返回 YYYY-MM-DD 格式）"""
+    
+    def test_normalize_mixed_formats(self):
+        """测试混合 YYYYMMDD / YYYY-MM-DD / 整数 / 空格输入"""
+        series = pd.Series(["20231225", "2024-01-01", 20240102, "  20240103  "])
+        result = DateHelper.normalize_series_to_yyyy_mm_dd(series)
+        assert result.tolist() == ["2023-12-25", "2024-01-01", "2024-01-02", "2024-01-03"]
+    
+    def test_normalize_keeps_missing_as_none(self):
+        """测试缺失值保持为 None"""
+        series = pd.Series(["20231225", None, float("nan")])
+        result = DateHelper.normalize_series_to_yyyy_mm_dd(series)
+        assert result.tolist() == ["2023-12-25", None, None]
+    
+    def test_normalize_invalid_date(self):
+        """测试无效日期和不支持的格式"""
+        with pytest.raises(ValueError):
+            DateHelper.normalize_series_to_yyyy_mm_dd(pd.Series(["20230230"]))
+        
+        with pytest.raises(ValueError):
+            DateHelper.normalize_series_to_yyyy_mm_dd(pd.Series(["2023/12/25"]))
+
+
 class TestNormalizeToYyyymmdd:
     """测试 normalize_to_yyyymmdd 方法（返回 YYYYMMDD 格式）"""
     
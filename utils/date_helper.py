@@ -1,6 +1,14 @@
+import re
 from datetime import date, datetime, timedelta
+from functools import lru_cache
 from typing import Union
 
+import numpy as np
+import pandas as pd
+
+# 支持的日期字符串格式：YYYYMMDD 或 YYYY-MM-DD
+_DATE_RE = re.compile(r'^(?:([0-9]{4})([0-9]{2})([0-9]{2})|([0-9]{4})-([0-9]{2})-([0-9]{2}))$')
+
 class DateHelper:
     """
     日期处理辅助类
@@ -10,9 +18,12 @@ class DateHelper:
     - 内部使用（fetch模块及以下）：统一使用 YYYY-MM-DD（MySQL DATE格式）
     - 数据库存储：YYYY-MM-DD（MySQL DATE格式）
     - API调用：需要时转换为 YYYYMMDD（如 Tushare API）
+    
+    单个日期的标准化结果会被缓存（交易日期在各次调用间大量重复）
     """
     
     @staticmethod
+    @lru_cache(maxsize=4096)
     def normalize_to_yyyy_mm_dd(date_str: str) -> str:
         """
         标准化日期格式为 YYYY-MM-DD（MySQL DATE格式）
@@ -25,31 +36,45 @@ class DateHelper:
         :return: YYYY-MM-DD 格式的日期字符串
         :raises ValueError: 如果日期格式无效
         """
-        if not date_str:
-            raise ValueError("Date string cannot be empty")
+        d = DateHelper._parse_date_parts(date_str)
+        return f"{d.year:04d}-{d.month:02d}-{d.day:02d}"
+
+    @staticmethod
+    def normalize_series_to_yyyy_mm_dd(series: pd.Series) -> pd.Series:
+        """
+        向量化地将日期列标准化为 YYYY-MM-DD 格式
         
-        date_str = str(date_str).strip()
+        与逐行调用 normalize_to_yyyy_mm_dd 语义一致，但解析在 pandas 的 C 层完成：
+        - 支持 YYYYMMDD（8位数字）和 YYYY-MM-DD（10位字符串），允许首尾空格
+        - 缺失值（None/NaN）保持为 None
         
-        # YYYY-MM-DD -> 验证后返回
-        if len(date_str) == 10 and date_str[4] == '-' and date_str[7] == '-':
-            try:
-                datetime.strptime(date_str, '%Y-%m-%d')
-                return date_str
-            except ValueError:
-                raise ValueError(f"Invalid date format: {date_str}")
-        
-        # YYYYMMDD -> YYYY-MM-DD
-        elif len(date_str) == 8 and date_str.isdigit():
-            try:
-                datetime.strptime(date_str, '%Y%m%d')
-                return f"{date_str[:4]}-{date_str[4:6]}-{date_str[6:8]}"
-            except ValueError:
-                raise ValueError(f"Invalid date format: {date_str}")
-        
-        else:
-            raise ValueError(f"Unsupported date format: {date_str}. Expected YYYYMMDD or YYYY-MM-DD")
+        :param series: 日期列
+        :return: YYYY-MM-DD 格式的字符串列（object dtype）
+        :raises ValueError: 如果存在无效日期或不支持的格式
+        """
+        mask = series.notna()
+        result = np.full(len(series), None, dtype=object)
+        if not mask.any():
+            return pd.Series(result, index=series.index)
+        
+        values = series[mask].astype(str).str.strip()
+        dashed = values.str.fullmatch(r'\d{4}-\d{2}-\d{2}')
+        digits = values.where(~dashed, values.str.replace('-', '', regex=False))
+        parsed = pd.to_datetime(
+            digits.where(digits.str.fullmatch(r'\d{8}')),
+            format='%Y%m%d',
+            errors='coerce'
+        )
+        
+        invalid = parsed.isna()
+        if invalid.any():
+            raise ValueError(f"Invalid date format: {values[invalid].iloc[0]}")
+        
+        result[mask.to_numpy()] = parsed.dt.strftime('%Y-%m-%d').to_numpy()
+        return pd.Series(result, index=series.index)
 
     @staticmethod
+    @lru_cache(maxsize=4096)
     def normalize_to_yyyymmdd(date_str: str) -> str:
         """
         标准化日期格式为 YYYYMMDD（项目统一格式）
@@ -62,29 +87,31 @@ class DateHelper:
         :return: YYYYMMDD 格式的日期字符串
         :raises ValueError: 如果日期格式无效
         """
+        d = DateHelper._parse_date_parts(date_str)
+        return f"{d.year:04d}{d.month:02d}{d.day:02d}"
+    
+    @staticmethod
+    def _parse_date_parts(date_str: str) -> date:
+        """
+        用预编译正则一次匹配 YYYYMMDD / YYYY-MM-DD 两种格式，并直接构造 date 校验日期有效性
+        
+        :param date_str: 输入日期字符串
+        :return: date对象
+        :raises ValueError: 如果日期格式无效
+        """
         if not date_str:
             raise ValueError("Date string cannot be empty")
         
         date_str = str(date_str).strip()
-        
-        # YYYYMMDD -> 验证后返回
-        if len(date_str) == 8 and date_str.isdigit():
-            try:
-                datetime.strptime(date_str, '%Y%m%d')
-                return date_str
-            except ValueError:
-                raise ValueError(f"Invalid date format: {date_str}")
-        
-        # YYYY-MM-DD -> YYYYMMDD
-        elif len(date_str) == 10 and date_str[4] == '-' and date_str[7] == '-':
-            try:
-                datetime.strptime(date_str, '%Y-%m-%d')
-                return date_str.replace('-', '')
-            except ValueError:
-                raise ValueError(f"Invalid date format: {date_str}")
-        
-        else:
+        m = _DATE_RE.match(date_str)
+        if m is None:
             raise ValueError(f"Unsupported date format: {date_str}. Expected YYYYMMDD or YYYY-MM-DD")
+        
+        year, month, day = (m.group(1, 2, 3) if m.group(1) is not None else m.group(4, 5, 6))
+        try:
+            return date(int(year), int(month), int(day))
+        except ValueError:
+            raise ValueError(f"Invalid date format: {date_str}")
     
     @staticmethod
     def today() -> str:
@@ -134,8 +161,18 @@ class DateHelper:
             return date_obj
         elif isinstance(date_obj, str):
             # 支持 YYYY-MM-DD 和 YYYYMMDD 两种格式
-            date_str_normalized = DateHelper.normalize_to_yyyy_mm_dd(date_obj)
-            return datetime.strptime(date_str_normalized, '%Y-%m-%d').date()
+            return DateHelper._parse_date_str(date_obj)
+    
+    @staticmethod
+    @lru_cache(maxsize=4096)
+    def _parse_date_str(date_str: str) -> date:
+        """
+        解析日期字符串为date对象（结果缓存，重复的交易日期只解析一次）
+        
+        :param date_str: 日期字符串（YYYY-MM-DD 或 YYYYMMDD 格式）
+        :return: date对象
+        """
+        return DateHelper._parse_date_parts(date_str)
     
     @staticmethod
     def parse_to_datetime(date_obj: Union[date, datetime, str]) -> datetime:
@@ -0,0 +1,15 @@
+"""
+环境变量加载工具
+
+.env 文件只在第一次需要读取配置时加载一次，而不是在各模块导入时分别查找和解析
+"""
+
+from functools import lru_cache
+
+from dotenv import load_dotenv
+
+
+@lru_cache(maxsize=None)
+def load_env() -> None:
+    """加载 .env 文件中的环境变量（进程内只执行一次，已存在的环境变量不会被覆盖）"""
+    load_dotenv()
@@ -7,12 +7,11 @@ import base64
 import urllib.parse
 import requests
 from json import load
-from dotenv import load_dotenv
-
-load_dotenv()
+from utils.env_helper import load_env
 
 class MessageRobot:
     def __init__(self):
+        load_env()
         self._secret = os.getenv('MESSAGE_ROBOT_SECRET')
         self._access_token = os.getenv('MESSAGE_ROBOT_ACCESS_TOKEN')
         # 去除可能的空白字符